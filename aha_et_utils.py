@@ -2,6 +2,8 @@
 import os
 from collections import deque
 
+import texte_utils
+
 
 # Structure des nœuds de l'arbre AHA
 class Noeud:
@@ -11,10 +13,23 @@ class Noeud:
         self.parent = None  # Parent
         self.fg = None  # Fils gauche
         self.fd = None  # Fils droit
+        # Chaînage dans l'ordre gdbh, tenu à jour par l'AHA au lieu de refaire le parcours
+        self.prec = None  # Nœud précédent dans gdbh
+        self.suiv = None  # Nœud suivant dans gdbh (None pour la racine)
+        self.profondeur = 0
+        self.hauteur = 0  # Profondeur maximale du sous-arbre (0 pour une feuille)
+
+
+DIEZE = object()  # Renvoyé par decoder_symbole pour le dièze, distinct de tout symbole (y compris "ᛃ")
 
 
 class AHA:
-    def __init__(self):
+    def __init__(self, historique=True):
+        # historique=True garde la recherche du nœud problématique d'origine (comparaison avec le père),
+        # indispensable pour relire les .huff du mode caractère. Elle peut casser la propriété
+        # de frère (et corrompre l'arbre) ; les nouveaux modes utilisent historique=False, qui
+        # compare chaque nœud à son successeur dans gdbh comme dans l'algorithme du cours.
+        self.historique = historique
         self.dieze = Noeud(
             "ᛃ"
         )  # Notre caractère spécial rune jera, car dièze n'est pas si rare dans les textes
@@ -22,6 +37,11 @@ class AHA:
         self.racine.parent = None
         self.dieze.poids = 0
         self.nodes = {"ᛃ": self.dieze} # Hashmap des feuilles, pour que contient() s'exécute en O(1)
+        if not historique:
+            # Le dièze n'est reconnu que par identité (self.dieze) : "ᛃ" est alors un symbole comme un autre
+            self.nodes = {}
+        self.tete = self.dieze  # Premier nœud de gdbh (la racine est toujours le dernier)
+        self.fins_de_bloc = {}  # Poids -> dernier nœud connu du bloc de ce poids (moteur corrigé, vérifié avant usage)
 
     def est_vide(self):
         if self.racine == self.dieze:
@@ -73,17 +93,215 @@ class AHA:
     def fin_de_bloc(self, noeud):
         # Renvoie le nœud de fin de bloc
         # — le nœud avant le premier nœud avec un poids différent du nœud en argument
-        gdbh = self.parcours_gdbh() # On récupère le parcours gdbh
-        bloc = False
-        for i in range(len(gdbh) - 1):
-            if gdbh[i] == noeud:
-                bloc = True # On a trouvé le bloc du meme poids
-            if bloc:
-                if gdbh[i].poids < gdbh[i + 1].poids:
-                    return gdbh[i] # On a trouvé notre fin de bloc
-        return gdbh[
-            len(gdbh) - 1
-        ]  # Cas où la racine serait le dernier élément de fin de bloc → c'est elle qu'on renvoie
+        courant = noeud
+        if not self.historique and (noeud.prec is None or noeud.prec.poids <= noeud.poids):
+            # Moteur corrigé : les poids croissent le long de gdbh, le bloc d'un poids est donc unique
+            # et l'on peut partir de n'importe lequel de ses nœuds, au lieu de parcourir tout le bloc
+            # (des milliers de feuilles de poids 1 sur un grand alphabet). La dernière fin connue est
+            # le plus souvent encore la fin, ou tout près ; si elle a été incrémentée depuis, le bloc
+            # se termine juste avant elle. Le nœud problématique juste derrière un fils déjà
+            # incrémenté (prec plus lourd) n'est pas dans ce cas : on part alors de lui.
+            fin = self.fins_de_bloc.get(noeud.poids)
+            if fin is not None and fin.poids > noeud.poids:
+                while fin.prec is not None and fin.prec.poids > noeud.poids:
+                    fin = fin.prec
+                fin = fin.prec
+            if fin is not None and fin.poids == noeud.poids:
+                courant = fin
+        # On avance dans le chaînage gdbh, sans refaire le parcours
+        while courant.suiv is not None:
+            if courant.poids < courant.suiv.poids:
+                break # On a trouvé notre fin de bloc
+            courant = courant.suiv
+        # Sinon la racine est le dernier élément de fin de bloc → c'est elle qu'on renvoie
+        if not self.historique:
+            self.noter_fin_de_bloc(courant)
+        return courant
+
+    # --- Maintien du chaînage gdbh (prec / suiv) lors des changements de structure ---
+    # Le prédécesseur d'un nœud dans gdbh est son voisin de gauche à la même profondeur,
+    # ou à défaut le nœud le plus à droite du niveau du dessous. Tout nœud interne ayant
+    # deux fils, les hauteurs suffisent à trouver ces nœuds en O(profondeur).
+
+    def reconstruire_gdbh(self):
+        # Recalcule profondeurs, hauteurs et chaînage à partir du parcours complet
+        ordre = self.parcours_gdbh()
+        for noeud in reversed(ordre):  # De la racine vers les feuilles
+            noeud.profondeur = 0 if noeud is self.racine else noeud.parent.profondeur + 1
+        for noeud in ordre:  # Des feuilles vers la racine
+            noeud.hauteur = 0 if noeud.fg is None else 1 + max(noeud.fg.hauteur, noeud.fd.hauteur)
+        for i, noeud in enumerate(ordre):
+            noeud.prec = ordre[i - 1] if i > 0 else None
+            noeud.suiv = ordre[i + 1] if i + 1 < len(ordre) else None
+        self.tete = ordre[0]
+
+    def maj_hauteurs(self, noeud):
+        # Recalcule la hauteur du nœud et de ses ancêtres, jusqu'au premier qui ne change pas
+        while noeud is not None:
+            hauteur = 0 if noeud.fg is None else 1 + max(noeud.fg.hauteur, noeud.fd.hauteur)
+            if hauteur == noeud.hauteur:
+                return
+            noeud.hauteur = hauteur
+            noeud = noeud.parent
+
+    def plus_a_droite(self, noeud, profondeur):
+        # Nœud le plus à droite à la profondeur donnée dans le sous-arbre (qui doit l'atteindre)
+        while noeud.profondeur < profondeur:
+            fd = noeud.fd
+            noeud = fd if fd.profondeur + fd.hauteur >= profondeur else noeud.fg
+        return noeud
+
+    def predecesseur_gdbh(self, noeud):
+        # Voisin de gauche à la même profondeur
+        courant = noeud
+        while courant.parent is not None:
+            parent = courant.parent
+            if parent.fd is courant:
+                frere = parent.fg
+                if frere.profondeur + frere.hauteur >= noeud.profondeur:
+                    return self.plus_a_droite(frere, noeud.profondeur)
+            courant = parent
+        # Sinon le nœud le plus à droite du niveau du dessous, s'il existe
+        if self.racine.hauteur > noeud.profondeur:
+            return self.plus_a_droite(self.racine, noeud.profondeur + 1)
+        return None
+
+    def retirer_gdbh(self, noeud):
+        if noeud.prec is not None:
+            noeud.prec.suiv = noeud.suiv
+        else:
+            self.tete = noeud.suiv
+        if noeud.suiv is not None:
+            noeud.suiv.prec = noeud.prec
+
+    def inserer_gdbh(self, noeud):
+        # Insère le nœud à sa place dans le chaînage (ses voisins doivent déjà y être)
+        prec = self.predecesseur_gdbh(noeud)
+        noeud.prec = prec
+        if prec is None:
+            noeud.suiv = self.tete
+            self.tete = noeud
+        else:
+            noeud.suiv = prec.suiv
+            prec.suiv = noeud
+        if noeud.suiv is not None:
+            noeud.suiv.prec = noeud
+
+    def lier(self, prec, suiv):
+        # Rend deux nœuds consécutifs dans le chaînage (prec None : suiv devient la tête)
+        if prec is None:
+            self.tete = suiv
+        else:
+            prec.suiv = suiv
+        if suiv is not None:
+            suiv.prec = prec
+
+    def echanger_segments(self, a1, a2, b1, b2):
+        # Échange dans le chaînage les segments disjoints [a1..a2] et [b1..b2], le premier précédant le second
+        avant_a, apres_a, avant_b, apres_b = a1.prec, a2.suiv, b1.prec, b2.suiv
+        self.lier(avant_a, b1)
+        if apres_a is b1:  # Segments adjacents
+            self.lier(b2, a1)
+        else:
+            self.lier(b2, apres_a)
+            self.lier(avant_b, a1)
+        self.lier(a2, apres_b)
+
+    def niveaux_sous_arbre(self, racine_sous_arbre):
+        # Nœuds du sous-arbre par niveau, de gauche à droite, en mettant à jour leur profondeur
+        niveaux = []
+        niveau = [racine_sous_arbre]
+        while niveau:
+            niveaux.append(niveau)
+            suivant = []
+            for noeud in niveau:
+                if noeud.fg is not None:
+                    noeud.fg.profondeur = noeud.profondeur + 1
+                    noeud.fd.profondeur = noeud.profondeur + 1
+                    suivant.append(noeud.fg)
+                    suivant.append(noeud.fd)
+            niveau = suivant
+        return niveaux
+
+    def est_a_gauche(self, a, b):
+        # Vrai si le nœud a est à gauche de b (aucun n'étant ancêtre de l'autre) :
+        # on remonte les deux nœuds jusqu'aux fils de leur ancêtre commun
+        while a.profondeur > b.profondeur:
+            a = a.parent
+        while b.profondeur > a.profondeur:
+            b = b.parent
+        while a.parent is not b.parent:
+            a = a.parent
+            b = b.parent
+        return a.parent.fg is a
+
+    def apres_echange(self, gm, b):
+        """
+        Remet à jour profondeurs, hauteurs et chaînage gdbh après l'échange des sous-arbres gm et b :
+        seuls les nœuds déplacés sont retirés puis réinsérés, niveau par niveau, du bas vers le haut.
+        """
+        if gm.parent is None or b.parent is None:  # Échange avec la racine : on repart de zéro
+            self.reconstruire_gdbh()
+            return
+        meme_profondeur = gm.profondeur == b.profondeur  # Profondeurs d'avant l'échange
+        if meme_profondeur and gm.fg is None and b.fg is None:
+            # Deux feuilles (le cas le plus fréquent) : elles échangent simplement leurs places
+            if self.est_a_gauche(gm, b):  # gm, désormais à gauche, suit encore b dans le chaînage
+                self.echanger_segments(b, b, gm, gm)
+            else:
+                self.echanger_segments(gm, gm, b, b)
+            return
+        gm.profondeur = gm.parent.profondeur + 1
+        b.profondeur = b.parent.profondeur + 1
+        if self.est_a_gauche(gm, b):
+            gauche, droite = gm, b
+        else:
+            gauche, droite = b, gm
+        niveaux_gauche = self.niveaux_sous_arbre(gauche)
+        niveaux_droite = self.niveaux_sous_arbre(droite)
+        if meme_profondeur:
+            self.echanger_niveaux(gm, b, niveaux_gauche, niveaux_droite)
+            return
+        for niveau in niveaux_gauche + niveaux_droite:
+            for noeud in niveau:
+                self.retirer_gdbh(noeud)
+        self.maj_hauteurs(gm.parent)
+        self.maj_hauteurs(b.parent)
+
+        # Réinsertion dans l'ordre gdbh : niveaux les plus profonds d'abord, de gauche à droite
+        par_profondeur = {}
+        for niveaux in (niveaux_gauche, niveaux_droite):
+            for niveau in niveaux:
+                par_profondeur.setdefault(niveau[0].profondeur, []).extend(niveau)
+        for profondeur in sorted(par_profondeur, reverse=True):
+            for noeud in par_profondeur[profondeur]:
+                self.inserer_gdbh(noeud)
+
+    def echanger_niveaux(self, gm, b, niveaux_gauche, niveaux_droite):
+        """
+        Cas courant de apres_echange : gm et b étaient à la même profondeur, aucune profondeur ne change.
+        À chaque niveau, les nœuds d'un sous-arbre forment un segment contigu du chaînage :
+        on échange les deux segments en O(1), au lieu de réinsérer chaque nœud.
+        """
+        seuls = []  # Segments des niveaux que l'autre sous-arbre n'atteint pas
+        for i in range(max(len(niveaux_gauche), len(niveaux_droite))):
+            if i < len(niveaux_gauche) and i < len(niveaux_droite):
+                # Avant l'échange, le sous-arbre désormais à droite était à gauche : son segment vient en premier
+                premier, second = niveaux_droite[i], niveaux_gauche[i]
+                self.echanger_segments(premier[0], premier[-1], second[0], second[-1])
+            else:
+                niveau = niveaux_gauche[i] if i < len(niveaux_gauche) else niveaux_droite[i]
+                self.lier(niveau[0].prec, niveau[-1].suiv)
+                seuls.append(niveau)
+        self.maj_hauteurs(gm.parent)
+        self.maj_hauteurs(b.parent)
+
+        # Les segments seuls sont réinsérés d'un bloc, les plus profonds d'abord
+        for niveau in reversed(seuls):
+            prec = self.predecesseur_gdbh(niveau[0])
+            suiv = self.tete if prec is None else prec.suiv
+            self.lier(prec, niveau[0])
+            self.lier(niveau[-1], suiv)
 
     def chemin_jusqua_racine(self, noeud):
         """
@@ -119,34 +337,74 @@ class AHA:
             self.racine.fd.parent = self.racine
             self.racine.parent = None
             self.nodes[symbole] = self.racine.fd
+            self.reconstruire_gdbh()
             return self
 
         elif not est_dans_parcours:
             Q = self.dieze.parent
+            ancien_dieze = self.dieze
             nouveau_noeud = Noeud("vide")
             nouveau_noeud.fg = self.insert_left(nouveau_noeud, "ᛃ")
             nouveau_noeud.fg.poids = 0
             nouveau_noeud.fd = self.insert_right(nouveau_noeud, symbole)
             nouveau_noeud.parent = Q
             self.dieze = nouveau_noeud.fg
-            Q.fg = nouveau_noeud  # On sait que c'est fg puisqu'on met toujours le dièze à gauche
             self.nodes[symbole] = nouveau_noeud.fd
+            if Q.fg is not ancien_dieze and self.historique:
+                # Le dièze n'est pas à gauche : le comportement d'origine écrase le fils gauche,
+                # on le reproduit à l'identique et on refait le chaînage complet
+                Q.fg = nouveau_noeud
+                self.reconstruire_gdbh()
+                return self.Traitement(Q)
+            if Q.fg is ancien_dieze:
+                Q.fg = nouveau_noeud  # Le dièze est normalement toujours à gauche
+            else:
+                Q.fd = nouveau_noeud
+            # Le nouveau nœud prend la place de l'ancien dièze dans gdbh, ses fils vont au niveau du dessous
+            nouveau_noeud.profondeur = ancien_dieze.profondeur
+            nouveau_noeud.prec = ancien_dieze.prec
+            nouveau_noeud.suiv = ancien_dieze.suiv
+            if nouveau_noeud.prec is not None:
+                nouveau_noeud.prec.suiv = nouveau_noeud
+            else:
+                self.tete = nouveau_noeud
+            nouveau_noeud.suiv.prec = nouveau_noeud
+            nouveau_noeud.fg.profondeur = nouveau_noeud.profondeur + 1
+            nouveau_noeud.fd.profondeur = nouveau_noeud.profondeur + 1
+            self.maj_hauteurs(nouveau_noeud)
+            self.inserer_gdbh(nouveau_noeud.fg)
+            self.inserer_gdbh(nouveau_noeud.fd)
         else:
             Q = noeud_correspondant
-            if Q.parent is not None and (Q.parent.fg.caractere == "ᛃ") and Q.parent == self.fin_de_bloc(Q):
-                Q.poids += 1
-                Q = Q.parent
+            if self.historique:
+                frere_du_dieze = Q.parent is not None and Q.parent.fg.caractere == "ᛃ"
+            else:
+                frere_du_dieze = Q.parent is not None and Q.parent is self.dieze.parent
+            if frere_du_dieze and Q.parent == self.fin_de_bloc(Q):
+                if not self.historique and Q.suiv is not Q.parent:
+                    # D'autres nœuds du bloc séparent Q de son père : incrémenter Q sur place casserait
+                    # l'ordre gdbh. On échange d'abord Q avec le dernier d'entre eux, puis cas général.
+                    self.echange_sous_arbres(Q, Q.parent.prec)
+                else:
+                    Q.poids += 1
+                    Q = Q.parent
         return self.Traitement(Q)
 
+    def noter_fin_de_bloc(self, noeud):
+        # Retient le nœud comme fin de son bloc s'il l'est (suivi d'un nœud plus lourd, ou racine)
+        if noeud is not None and (noeud.suiv is None or noeud.suiv.poids > noeud.poids):
+            self.fins_de_bloc[noeud.poids] = noeud
+
     def Traitement(self, Q):
         # Adaptation de la fonction du cours
+        if not self.historique:
+            return self.traitement_corrige(Q)
         gamma = self.chemin_jusqua_racine(Q)
-        gdbh = self.parcours_gdbh()
         successeur_direct_gamma_superieur = True
-        for i in range(len(gdbh) - 1):  # On met -1 pour exclure la racine
-            if gdbh[i] in gamma:
-                if gdbh[i].poids >= gdbh[i + 1].poids:
-                    successeur_direct_gamma_superieur = False
+        for noeud in gamma:  # Le successeur dans gdbh est donné par le chaînage (None pour la racine)
+            if noeud.suiv is not None and noeud.poids >= noeud.suiv.poids:
+                successeur_direct_gamma_superieur = False
+                break
 
         if successeur_direct_gamma_superieur:  # Les poids sont incrémentables
             for i in gamma:
@@ -163,33 +421,69 @@ class AHA:
             b = self.fin_de_bloc(gm)
             for i in range(m + 1):
                 gamma[i].poids += 1
-            # Échange sous arbres
-            parent_original_b = b.parent
-            if parent_original_b is None:  # La racine est fin de bloc
-                est_b_racine = True
+            if self.echange_sous_arbres(gm, b):
+                return self
+        return self.Traitement(gm.parent)
+
+    def traitement_corrige(self, Q):
+        """
+        Traitement du moteur corrigé : chaque nœud dont le successeur dans gdbh a le même poids
+        est échangé avec la fin de son bloc avant d'être incrémenté, puis on passe à son père.
+        Une seule remontée de Q à la racine, sans liste du chemin ni nouvel appel après chaque
+        échange : le successeur d'un nœud n'est jamais un de ses descendants, incrémenter les
+        nœuds du dessous avant de le tester ne change donc pas le résultat.
+        """
+        noeud = Q
+        while noeud is not None:
+            suiv = noeud.suiv
+            if suiv is not None and noeud.poids >= suiv.poids:  # Nœud problématique
+                b = self.fin_de_bloc(noeud)
+                noeud.poids += 1
+                if self.echange_sous_arbres(noeud, b):
+                    return self
+                # noeud a pris la place de la fin de son ancien bloc : son prédécesseur termine désormais
+                # ce bloc, et noeud peut terminer celui de son nouveau poids
+                self.noter_fin_de_bloc(noeud.prec)
+                self.noter_fin_de_bloc(noeud)
             else:
-                est_fgb = b.parent.fg == b
-                est_b_racine = False
-            if gm.parent is None:  # Cas de la racine
-                self.racine = b
-                b.parent = None
+                noeud.poids += 1
+            noeud = noeud.parent
+        return self
+
+    def echange_sous_arbres(self, gm, b):
+        """
+        Échange les sous-arbres gm et b et met à jour le chaînage gdbh.
+        Renvoie True si b était la racine (gm devient alors la racine).
+        """
+        parent_original_b = b.parent
+        if parent_original_b is None:  # La racine est fin de bloc
+            est_b_racine = True
+        else:
+            est_fgb = b.parent.fg == b
+            est_b_racine = False
+        if gm.parent is None:  # Cas de la racine
+            self.racine = b
+            b.parent = None
+        else:
+            est_fg = gm.parent.fg == gm
+            if est_fg:
+                gm.parent.fg = b
             else:
-                est_fg = gm.parent.fg == gm
-                if est_fg:
-                    gm.parent.fg = b
-                else:
-                    gm.parent.fd = b
-                b.parent = gm.parent
-            gm.parent = parent_original_b
-            if not est_b_racine:
-                if est_fgb:
-                    parent_original_b.fg = gm
-                else:
-                    parent_original_b.fd = gm
+                gm.parent.fd = b
+            b.parent = gm.parent
+        gm.parent = parent_original_b
+        if not est_b_racine:
+            if est_fgb:
+                parent_original_b.fg = gm
             else:
-                self.racine = gm
-                return self
-        return self.Traitement(gm.parent)
+                parent_original_b.fd = gm
+        else:
+            self.racine = gm
+            self.reconstruire_gdbh()
+            return True
+        if b is not gm:  # Sinon l'échange ne change rien
+            self.apres_echange(gm, b)
+        return False
 
     def encodage_caractere_arbre(self, caractere):
         """
@@ -209,6 +503,81 @@ class AHA:
                 pile.append((fd, chemin + "1"))
         return None
 
+    def code_feuille(self, feuille):
+        """
+        Renvoie le codage binaire d'une feuille en remontant jusqu'à la racine,
+        en O(profondeur) au lieu du parcours complet de encodage_caractere_arbre.
+        """
+        bits = []
+        noeud = feuille
+        while noeud is not self.racine and noeud.parent is not None:
+            bits.append("0" if noeud.parent.fg is noeud else "1")
+            noeud = noeud.parent
+        bits.reverse()
+        return "".join(bits)
+
+    def code_symbole(self, symbole):
+        """
+        Renvoie le codage binaire du symbole, ou None s'il n'est pas dans l'arbre.
+        """
+        feuille = self.contient(symbole)
+        if feuille is None or (self.historique and symbole == "ᛃ"):
+            return None
+        return self.code_feuille(feuille)
+
+    def code_dieze(self):
+        # Codage du caractère spécial (en historique, l'entrée "ᛃ" de nodes n'est plus à jour après la première insertion)
+        return self.code_feuille(self.dieze)
+
+    def decoder_symbole(self, lecteur_bits):
+        """
+        Descend depuis la racine selon les bits lus jusqu'à une feuille et renvoie son caractère,
+        ou DIEZE si cette feuille est le dièze (reconnu par identité, pas par son caractère).
+        Renvoie None si le flux est épuisé avant d'atteindre une feuille.
+        """
+        noeud = self.racine
+        while noeud.fg is not None:
+            bit = lecteur_bits.lire_bit()
+            if bit is None:
+                return None
+            noeud = noeud.fd if bit == 1 else noeud.fg
+        if noeud is self.dieze:
+            return DIEZE
+        return noeud.caractere
+
+    def coder_caractere(self, symbole, vers_bits=texte_utils.char_to_bits):
+        """
+        Renvoie le codage du symbole (dièze puis littéral vers_bits(symbole) s'il est nouveau)
+        et met l'arbre à jour. Par défaut le littéral est le caractère en UTF-8.
+        """
+        code = self.code_symbole(symbole)
+        if code is None:
+            code = self.code_dieze() + vers_bits(symbole)
+        self.modification(symbole)
+        return code
+
+    def decoder_caractere(self, lecteur_bits, lire_litteral=texte_utils.lire_caractere_utf8):
+        """
+        Inverse de coder_caractere : décode un symbole (littéral lu par lire_litteral après
+        le dièze) et met l'arbre à jour. Renvoie None si le flux est épuisé.
+        """
+        symbole = self.decoder_symbole(lecteur_bits)
+        if symbole is None:
+            return None
+        if symbole is DIEZE:
+            symbole = lire_litteral(lecteur_bits)
+        self.modification(symbole)
+        return symbole
+
+    def nb_symboles(self):
+        # Symboles distincts de l'arbre (en historique, nodes contient aussi l'entrée "ᛃ")
+        return len(self.nodes) - 1 if self.historique else len(self.nodes)
+
+    def nb_noeuds(self):
+        # Chaque symbole ajoute une feuille et un nœud interne, plus la feuille dièze
+        return 2 * self.nb_symboles() + 1
+
+
 """
 Fonctions qui ajoutent des statistiques de compression/decompression
 """
@@ -217,10 +586,11 @@ NOM_REGISTRE_COMPR = "compression.txt"
 NOM_REGISTRE_DECOMPR = "decompression.txt"
 
 def mettre_a_jour_registre_compression(
-    chemin_entree: str, chemin_sortie: str, duree: float
+    chemin_entree: str, chemin_sortie: str, duree: float, statut_cache: str = ""
 ) -> None:
     """
     Ajoute une ligne des statistiques dans "compression.txt"
+    Avec le cache, une dernière colonne indique "hit" ou "miss".
     """
     nom_entree = os.path.basename(chemin_entree)
     nom_sortie = os.path.basename(chemin_sortie)
@@ -241,7 +611,9 @@ def mettre_a_jour_registre_compression(
 
     with open(NOM_REGISTRE_COMPR, "a", encoding="utf-8") as registre:
         registre.write(
-            f"{nom_entree};{nom_sortie};{taille_entree};{taille_sortie};{taux:.5f};{duree}\n"
+            f"{nom_entree};{nom_sortie};{taille_entree};{taille_sortie};{taux:.5f};{duree}"
+            + (f";{statut_cache}" if statut_cache else "")
+            + "\n"
         )
 
 def mettre_a_jour_registre_decompression(
@@ -262,7 +634,7 @@ def mettre_a_jour_registre_decompression(
     except OSError:
         taille_sortie = 0
 
-    if taille_entree > 0:
+    if taille_sortie > 0:  # Fichier vide décompressé : pas de taux
         taux = taille_entree / taille_sortie # Pour obténir le meme taux qu'a la compression
     else:
         taux = 0.0
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import argparse
+import io
+import os
+import sys
+import time
+
+import aha_et_utils
+import modele_mots
+import texte_utils
+
+"""
+Archive multi-fichiers : beaucoup de petits textes dans un seul conteneur.
+
+Les fichiers sont codés à la suite dans des groupes qui partagent un même arbre AHA :
+l'arbre n'est pas réinitialisé entre deux fichiers d'un groupe, on évite donc
+l'échauffement (dièze + UTF-8 pour chaque caractère nouveau) à chaque fichier.
+Extraire une entrée ne demande de décoder que son groupe, jusqu'à elle.
+
+Format :
+    [8 octets en-tête = MODE_ARCHIVE + position de la table des matières]
+    [flux de bits de chaque groupe, commençant chacun sur un octet, padding de 0]
+    [table des matières]
+
+Table des matières (entiers variables comme dans modele_mots) :
+    nb_groupes, puis pour chaque groupe : position (octets), nb_bits
+    nb_entrees, puis pour chaque entrée : nom (littéral UTF-8), taille (octets), groupe, nb_bits
+"""
+
+TAILLE_GROUPE_KIO_DEFAUT = 1024  # 0 = un seul groupe, codage continu sur toute l'archive
+
+
+class Entree:
+    """
+    Un fichier de l'archive. 'debut_bits' est sa position dans le flux de son groupe.
+    """
+
+    def __init__(self, nom: str, taille: int, groupe: int, debut_bits: int, nb_bits: int):
+        self.nom = nom
+        self.taille = taille
+        self.groupe = groupe
+        self.debut_bits = debut_bits
+        self.nb_bits = nb_bits
+
+
+class EcrivainArchive:
+    """
+    Construit une archive dans 'fout' (flux binaire positionnable) :
+
+        ecrivain = EcrivainArchive(fout)
+        ecrivain.ajouter("a.txt", fin_a)
+        ecrivain.ajouter("b.txt", fin_b)
+        ecrivain.terminer()
+    """
+
+    def __init__(self, fout, taille_groupe_kio: int = TAILLE_GROUPE_KIO_DEFAUT):
+        self.fout = fout
+        self.taille_groupe = taille_groupe_kio * 1024
+        self.position_entete = texte_utils.reserver_entete(fout)
+        self.groupes = []  # [position, nb_bits]
+        self.entrees = []
+        self.arbre = None
+        self.etat = None
+        self.octets_groupe = 0
+
+    def ouvrir_groupe(self) -> None:
+        self.fermer_groupe()
+        self.groupes.append([self.fout.tell(), 0])
+        self.arbre = aha_et_utils.AHA(historique=False)
+        self.etat = {"current_byte": 0, "bit_pos": 0, "nb_bits": 0}
+        self.octets_groupe = 0
+
+    def fermer_groupe(self) -> None:
+        if self.arbre is None:
+            return
+        texte_utils.completer_octet(self.fout, self.etat)  # Le groupe suivant commence sur un octet
+        self.groupes[-1][1] = self.etat["nb_bits"]
+        self.arbre = None
+
+    def ajouter(self, nom: str, fin) -> Entree:
+        """
+        Code le flux binaire UTF-8 'fin' à la suite du groupe courant.
+        """
+        if self.arbre is None or (self.taille_groupe and self.octets_groupe >= self.taille_groupe):
+            self.ouvrir_groupe()
+
+        debut_bits = self.etat["nb_bits"]
+        debut_octets = fin.tell()
+        for ch in texte_utils.lire_caracteres(fin):
+            bits = self.arbre.coder_caractere(ch)  # Caractère nouveau dans le groupe : dièze + UTF-8
+            if bits:
+                texte_utils.ecrire_bits(self.fout, bits, self.etat)
+
+        taille = fin.tell() - debut_octets
+        entree = Entree(nom, taille, len(self.groupes) - 1, debut_bits, self.etat["nb_bits"] - debut_bits)
+        self.entrees.append(entree)
+        self.octets_groupe += taille
+        return entree
+
+    def terminer(self) -> None:
+        """
+        Ferme le dernier groupe, écrit la table des matières puis l'en-tête.
+        """
+        self.fermer_groupe()
+        position_table = self.fout.tell()
+
+        bits = [modele_mots.entier_vers_bits(len(self.groupes))]
+        for position, nb_bits in self.groupes:
+            bits.append(modele_mots.entier_vers_bits(position))
+            bits.append(modele_mots.entier_vers_bits(nb_bits))
+        bits.append(modele_mots.entier_vers_bits(len(self.entrees)))
+        for entree in self.entrees:
+            bits.append(modele_mots.litteral_vers_bits(entree.nom))
+            bits.append(modele_mots.entier_vers_bits(entree.taille))
+            bits.append(modele_mots.entier_vers_bits(entree.groupe))
+            bits.append(modele_mots.entier_vers_bits(entree.nb_bits))
+        table = "".join(bits)  # Entiers et littéraux sont des octets entiers
+        self.fout.write(int(table, 2).to_bytes(len(table) // 8, "big"))
+
+        texte_utils.ecrire_entete_reservee(self.fout, self.position_entete, texte_utils.MODE_ARCHIVE, position_table)
+
+
+def lire_table(fin):
+    """
+    Lit la table des matières d'une archive et renvoie (groupes, entrees).
+    Lève ValueError si le fichier n'est pas une archive.
+    """
+    _, position_table = texte_utils.lire_entete(
+        fin.read(texte_utils.TAILLE_ENTETE_OCTETS), (texte_utils.MODE_ARCHIVE,)
+    )
+    fin.seek(position_table)
+    table = fin.read()
+    lecteur = texte_utils.LecteurBits(io.BytesIO(table), 8 * len(table))
+
+    groupes = []
+    for _ in range(modele_mots.lire_entier(lecteur)):
+        position = modele_mots.lire_entier(lecteur)
+        groupes.append((position, modele_mots.lire_entier(lecteur)))
+
+    entrees = []
+    debuts = [0] * len(groupes)
+    for _ in range(modele_mots.lire_entier(lecteur)):
+        nom = modele_mots.lire_litteral(lecteur)
+        taille = modele_mots.lire_entier(lecteur)
+        groupe = modele_mots.lire_entier(lecteur)
+        nb_bits = modele_mots.lire_entier(lecteur)
+        if groupe >= len(groupes):
+            raise ValueError(f"Archive invalide : groupe {groupe} inconnu pour '{nom}'.")
+        entrees.append(Entree(nom, taille, groupe, debuts[groupe], nb_bits))
+        debuts[groupe] += nb_bits
+    return groupes, entrees
+
+
+def chemin_extraction(dossier: str, nom: str) -> str:
+    """
+    Chemin de sortie d'une entrée ; refuse les noms qui sortiraient du dossier.
+    """
+    nom_normalise = os.path.normpath(nom)
+    if os.path.isabs(nom_normalise) or nom_normalise.split(os.sep)[0] == "..":
+        raise ValueError(f"Archive invalide : nom d'entrée dangereux '{nom}'.")
+    return os.path.join(dossier, nom_normalise)
+
+
+def extraire(fin, groupes, entrees, dossier: str, noms=None) -> list:
+    """
+    Extrait les entrées demandées ('noms', ou toutes si None) dans 'dossier'.
+    Seuls les groupes concernés sont décodés, et chacun seulement jusqu'à sa dernière entrée demandée.
+    Renvoie la liste des entrées extraites.
+    """
+    voulues = [e for e in entrees if noms is None or e.nom in noms]
+    if noms is not None:
+        manquants = set(noms) - {e.nom for e in voulues}
+        if manquants:
+            raise ValueError(f"Entrée(s) absente(s) de l'archive : {', '.join(sorted(manquants))}")
+
+    a_ecrire = {id(e) for e in voulues}
+    for groupe in sorted({e.groupe for e in voulues}):
+        position, nb_bits = groupes[groupe]
+        fin.seek(position)
+        lecteur = texte_utils.LecteurBits(fin, nb_bits)
+        arbre = aha_et_utils.AHA(historique=False)
+        derniere = max(e.debut_bits for e in voulues if e.groupe == groupe)
+
+        for entree in entrees:
+            if entree.groupe != groupe or entree.debut_bits > derniere:
+                continue
+            fichier_sortie = None
+            if id(entree) in a_ecrire:
+                chemin = chemin_extraction(dossier, entree.nom)
+                os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+                fichier_sortie = open(chemin, "w", encoding="utf-8", newline="")
+
+            fin_entree = entree.debut_bits + entree.nb_bits
+            while nb_bits - lecteur.nb_bits_restants < fin_entree:
+                ch = arbre.decoder_caractere(lecteur)
+                if ch is None:
+                    break
+                if fichier_sortie is not None:
+                    fichier_sortie.write(ch)
+
+            if fichier_sortie is not None:
+                fichier_sortie.close()
+    return voulues
+
+
+def fichiers_a_archiver(chemins):
+    """
+    Générateur de couples (nom dans l'archive, chemin) ; les dossiers sont parcourus récursivement.
+    """
+    for chemin in chemins:
+        base = os.path.dirname(os.path.normpath(chemin))
+        if os.path.isdir(chemin):
+            for racine, dossiers, fichiers in os.walk(chemin):
+                dossiers.sort()
+                for nom in sorted(fichiers):
+                    complet = os.path.join(racine, nom)
+                    yield os.path.relpath(complet, base).replace(os.sep, "/"), complet
+        else:
+            yield os.path.relpath(chemin, base).replace(os.sep, "/"), chemin
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive multi-fichiers AHA (modèle partagé par groupe).")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    creer = commandes.add_parser("creer", help="Crée une archive")
+    creer.add_argument("archive")
+    creer.add_argument("fichiers", nargs="+", help="Fichiers ou dossiers à archiver")
+    creer.add_argument("--taille-groupe-kio", type=int, default=TAILLE_GROUPE_KIO_DEFAUT,
+                       help="Texte cumulé par groupe avant de repartir d'un arbre vide (0 = un seul groupe)")
+
+    lister = commandes.add_parser("lister", help="Affiche la table des matières")
+    lister.add_argument("archive")
+
+    extraire_cmd = commandes.add_parser("extraire", help="Extrait tout ou partie de l'archive")
+    extraire_cmd.add_argument("archive")
+    extraire_cmd.add_argument("noms", nargs="*", help="Entrées à extraire (toutes par défaut)")
+    extraire_cmd.add_argument("--dossier", default=".", help="Dossier de destination")
+    args = parser.parse_args()
+
+    debut = time.perf_counter()
+    try:
+        if args.commande == "creer":
+            with open(args.archive, "wb") as fout:
+                ecrivain = EcrivainArchive(fout, args.taille_groupe_kio)
+                for nom, chemin in fichiers_a_archiver(args.fichiers):
+                    with open(chemin, "rb") as fin:
+                        ecrivain.ajouter(nom, fin)
+                ecrivain.terminer()
+            taille_entree = sum(e.taille for e in ecrivain.entrees)
+            taille_sortie = os.path.getsize(args.archive)
+            print(f"Archive '{args.archive}' : {len(ecrivain.entrees)} fichiers, "
+                  f"{len(ecrivain.groupes)} groupe(s), {taille_entree} → {taille_sortie} octets "
+                  f"({taille_sortie / max(taille_entree, 1):.3f}) en {time.perf_counter() - debut:.2f} s")
+
+        elif args.commande == "lister":
+            with open(args.archive, "rb") as fin:
+                groupes, entrees = lire_table(fin)
+            print(f"{'taille':>10} {'groupe':>6} {'début (bits)':>13} {'bits':>10}  nom")
+            for e in entrees:
+                print(f"{e.taille:10d} {e.groupe:6d} {e.debut_bits:13d} {e.nb_bits:10d}  {e.nom}")
+            print(f"{len(entrees)} entrées, {len(groupes)} groupe(s)")
+
+        else:
+            with open(args.archive, "rb") as fin:
+                groupes, entrees = lire_table(fin)
+                extraites = extraire(fin, groupes, entrees, args.dossier, args.noms or None)
+            print(f"{len(extraites)} entrée(s) extraite(s) dans '{args.dossier}' "
+                  f"en {time.perf_counter() - debut:.2f} s")
+    except (OSError, ValueError) as e:
+        print(f"Erreur : {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import argparse
+import io
+import random
+import time
+from multiprocessing import Pool
+
+import compressor
+import gen_random_text
+import memoire
+import profileur
+import texte_utils
+
+try:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+except ImportError:  # matplotlib est optionnel : sans lui, seuls le tableau et le CSV sont produits
+    plt = None
+
+"""
+Temps et mémoire de l'AHA selon la taille de l'alphabet (de 26 à 50 000 symboles).
+
+Les textes sont tirés avec gen_random_text (loi de Zipf). Au-delà de 26 symboles,
+l'alphabet est pris dans les idéogrammes CJK (U+4E00...) puis au-delà, comme le
+ferait un texte chinois ou riche en emojis. Chaque taille est mesurée dans un
+processus neuf pour que le RSS maximal ne mélange pas les mesures.
+"""
+
+TAILLES_DEFAUT = "26,100,500,1000,5000,10000,20000,50000"
+PREMIER_POINT_DE_CODE = 0x4E00
+
+
+def alphabet_de_taille(k: int) -> list:
+    if k <= 26:
+        return [chr(ord("a") + i) for i in range(k)]
+    symboles = []
+    point = PREMIER_POINT_DE_CODE
+    while len(symboles) < k:
+        if not 0xD800 <= point <= 0xDFFF and point & 0xFFFE != 0xFFFE:  # Ni surrogates ni non-caractères
+            symboles.append(chr(point))
+        point += 1
+    return symboles
+
+
+def mesurer(args) -> dict:
+    k, nb_symboles, zipf_s, mode = args
+    random.seed(42)
+    texte = gen_random_text.sample_text(alphabet_de_taille(k), gen_random_text.build_zipf_probs(k, zipf_s),
+                                        nb_symboles)
+    donnees = texte.encode("utf-8")
+
+    # Durée sans tracemalloc, puis mesures mémoire de l'arbre sous tracemalloc
+    fout = io.BytesIO()
+    debut = time.perf_counter()
+    compressor.compresser_flux(io.BytesIO(donnees), fout, mode)
+    duree = time.perf_counter() - debut
+
+    mesures = memoire.mesurer_arbre(texte)
+    mesures.update({
+        "alphabet": k,
+        "duree_s": duree,
+        "us_par_symbole": 1e6 * duree / nb_symboles,
+        "taux": len(fout.getvalue()) / len(donnees),
+        "rss_max_mio": profileur.rss_max_kio() / 1024,
+    })
+    return mesures
+
+
+COLONNES = ["alphabet", "distincts", "noeuds", "duree_s", "us_par_symbole", "taux",
+            "octets_arbre", "octets_par_noeud", "transitoire_moyen", "transitoire_max", "rss_max_mio"]
+
+
+def tracer(resultats: list, chemin: str) -> None:
+    alphabets = [r["alphabet"] for r in resultats]
+    figure, (temps, mem) = plt.subplots(1, 2, figsize=(11, 4))
+    temps.plot(alphabets, [r["us_par_symbole"] for r in resultats], marker="o")
+    temps.set_xscale("log")
+    temps.set_xlabel("taille de l'alphabet")
+    temps.set_ylabel("µs par symbole")
+    temps.set_title("Temps de compression")
+    mem.plot(alphabets, [r["octets_arbre"] / 1024 for r in resultats], marker="o", label="arbre (Kio)")
+    mem.plot(alphabets, [r["rss_max_mio"] * 1024 for r in resultats], marker="s", label="RSS max (Kio)")
+    mem.set_xscale("log")
+    mem.set_yscale("log")
+    mem.set_xlabel("taille de l'alphabet")
+    mem.set_title("Mémoire")
+    mem.legend()
+    figure.tight_layout()
+    figure.savefig(chemin)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps et mémoire de l'AHA selon la taille de l'alphabet.")
+    parser.add_argument("--tailles", default=TAILLES_DEFAUT, help="Tailles d'alphabet, séparées par des virgules")
+    parser.add_argument("--N", type=int, default=50000, help="Nombre de symboles par texte")
+    parser.add_argument("--zipf_s", type=float, default=1.0, help="Paramètre s de la loi de Zipf")
+    parser.add_argument("--mode", default=texte_utils.NOMS_MODES[texte_utils.MODE_CONTINU],
+                        choices=list(texte_utils.NOMS_MODES.values()),
+                        help="Mode de compression chronométré (par défaut : ordre 0, moteur corrigé)")
+    parser.add_argument("--csv", default="", help="Fichier CSV des résultats")
+    parser.add_argument("--graphique", default="bench_alphabet.png", help="Image des courbes (matplotlib)")
+    args = parser.parse_args()
+    mode = {nom: m for m, nom in texte_utils.NOMS_MODES.items()}[args.mode]
+
+    print("| alphabet | distincts | nœuds | µs/symbole | taux | arbre (Kio) | octets/nœud "
+          "| transitoire moyen (o) | transitoire max (o) | RSS max (Mio) |")
+    print("|---|---|---|---|---|---|---|---|---|---|")
+    resultats = []
+    with Pool(processes=1, maxtasksperchild=1) as pool:
+        for k in (int(t) for t in args.tailles.split(",")):
+            r = pool.apply(mesurer, ((k, args.N, args.zipf_s, mode),))
+            resultats.append(r)
+            print(f"| {k} | {r['distincts']} | {r['noeuds']} | {r['us_par_symbole']:.1f} | {r['taux']:.3f} "
+                  f"| {r['octets_arbre'] / 1024:.1f} | {r['octets_par_noeud']:.0f} | {r['transitoire_moyen']:.0f} "
+                  f"| {r['transitoire_max']} | {r['rss_max_mio']:.1f} |", flush=True)
+
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8") as f:
+            f.write(",".join(COLONNES) + "\n")
+            for r in resultats:
+                f.write(",".join(str(r[c]) for c in COLONNES) + "\n")
+    if plt is None:
+        print("matplotlib absent : pas de graphique (utiliser --csv pour tracer ailleurs).")
+    else:
+        tracer(resultats, args.graphique)
+        print(f"Graphique écrit dans {args.graphique}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import argparse
+import glob
+import io
+import os
+import time
+from multiprocessing import Pool
+
+import compressor
+import modele_ordre1
+import profileur
+import texte_utils
+
+"""
+Compare les modes de codage (caractère, ordre 1, mots...) sur les textes de test_texts/ :
+taux de compression, débit et pic de mémoire (RSS). Chaque mesure tourne dans
+un processus neuf pour que le pic de RSS ne soit pas pollué par la mesure précédente.
+"""
+
+
+def mesurer(args) -> tuple:
+    chemin, mode, budget_kio, limite = args
+    with open(chemin, "rb") as f:
+        donnees = f.read(limite) if limite > 0 else f.read()
+
+    rss_avant = profileur.rss_max_kio()
+    fout = io.BytesIO()
+    debut = time.perf_counter()
+    compressor.compresser_flux(io.BytesIO(donnees), fout, mode, budget_kio)
+    duree = time.perf_counter() - debut
+    rss_apres = profileur.rss_max_kio()
+
+    taille = len(fout.getvalue())
+    taux = taille / len(donnees) if donnees else 0.0
+    debit_kio = len(donnees) / 1024 / duree if duree > 0 else 0.0
+    return len(donnees), taille, taux, debit_kio, max(rss_apres, rss_avant)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc d'essai des modes de codage sur test_texts/.")
+    parser.add_argument("--dossier", default="test_texts", help="Dossier des textes")
+    parser.add_argument("--budget-kio", type=int, default=modele_ordre1.BUDGET_KIO_DEFAUT,
+                        help="Budget mémoire du pool de contextes d'ordre 1")
+    parser.add_argument("--modes", default=",".join(texte_utils.NOMS_MODES.values()),
+                        help="Modes à comparer, séparés par des virgules")
+    parser.add_argument("--limite", type=int, default=0,
+                        help="Ne compresse que les N premiers octets de chaque texte (0 = tout)")
+    args = parser.parse_args()
+
+    fichiers = sorted(glob.glob(os.path.join(args.dossier, "*.txt")))
+    modes_par_nom = {nom: mode for mode, nom in texte_utils.NOMS_MODES.items()}
+    modes = [modes_par_nom[nom] for nom in args.modes.split(",")]
+
+    print("| texte | mode | taille | compressé | taux | débit (Kio/s) | RSS max (Mio) |")
+    print("|---|---|---|---|---|---|---|")
+    with Pool(processes=1, maxtasksperchild=1) as pool:
+        for chemin in fichiers:
+            for mode in modes:
+                taille, compresse, taux, debit, rss = pool.apply(mesurer, ((chemin, mode, args.budget_kio, args.limite),))
+                print(f"| {os.path.basename(chemin)} | {texte_utils.NOMS_MODES[mode]} | {taille} | {compresse} "
+                      f"| {taux:.5f} | {debit:.1f} | {rss / 1024:.1f} |", flush=True)
+
+
+if __name__ == "__main__":
+    main()
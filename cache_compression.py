@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import hashlib
+import os
+import shutil
+
+"""
+Cache disque des résultats de compression, indexé par le contenu du fichier d'entrée.
+
+La clé réunit l'empreinte SHA-256 de l'entrée, le mode (et ses paramètres) et VERSION_CODEC :
+un fichier déjà compressé avec les mêmes réglages n'est pas recompressé, on le copie
+(ou on crée un lien dur) depuis le cache. Chaque entrée est un fichier <clé>.huff dont
+la date de modification sert d'horodatage LRU ; au-delà de la taille maximale,
+les entrées les moins récemment utilisées sont supprimées.
+"""
+
+VERSION_CODEC = 2  # À incrémenter à chaque changement du format ou du codage
+DOSSIER_CACHE_DEFAUT = os.path.join(os.path.expanduser("~"), ".cache", "aha")
+TAILLE_CACHE_MIO_DEFAUT = 256
+EXTENSION_CACHE = ".huff"
+
+
+def empreinte_fichier(chemin: str) -> str:
+    with open(chemin, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class CacheCompression:
+    """
+    'liens_durs' : les sorties sont des liens durs vers le cache au lieu de copies.
+    Plus rapide et sans doublon sur le disque, mais les sorties doivent alors être
+    traitées en lecture seule (les modifier en place modifierait l'entrée du cache).
+    ./compresser et le client remplacent leur sortie (os.replace) au lieu de la réécrire.
+    """
+
+    def __init__(self, dossier: str = DOSSIER_CACHE_DEFAUT, taille_max_mio: int = TAILLE_CACHE_MIO_DEFAUT,
+                 liens_durs: bool = False):
+        self.dossier = dossier
+        self.taille_max = taille_max_mio * 1024 * 1024
+        self.liens_durs = liens_durs
+        os.makedirs(dossier, exist_ok=True)
+
+    def cle(self, chemin_entree: str, mode: int, parametres: str = "") -> str:
+        return f"{empreinte_fichier(chemin_entree)}-m{mode}{parametres}-v{VERSION_CODEC}"
+
+    def chemin(self, cle: str) -> str:
+        return os.path.join(self.dossier, cle + EXTENSION_CACHE)
+
+    def placer(self, source: str, destination: str) -> None:
+        """
+        Lien dur si demandé et possible (même système de fichiers), copie sinon.
+        Une destination existante est d'abord retirée : ce peut être un lien dur vers
+        l'entrée du cache (run précédent avec --cache-liens), qu'une copie modifierait.
+        """
+        infos_source = os.stat(source)  # FileNotFoundError avant de toucher à la destination
+        try:
+            infos_destination = os.stat(destination)
+        except FileNotFoundError:
+            pass
+        else:
+            if os.path.samestat(infos_source, infos_destination) and self.liens_durs:
+                return  # Déjà un lien dur vers la source
+            os.remove(destination)
+        if self.liens_durs:
+            try:
+                os.link(source, destination)
+                return
+            except OSError:
+                pass
+        shutil.copyfile(source, destination)
+
+    def recuperer(self, cle: str, chemin_sortie: str) -> bool:
+        """
+        Écrit le résultat en cache dans 'chemin_sortie'. Renvoie False si la clé est absente.
+        """
+        source = self.chemin(cle)
+        try:
+            self.placer(source, chemin_sortie)
+        except FileNotFoundError:
+            return False
+        os.utime(source)  # Entrée la plus récemment utilisée
+        return True
+
+    def stocker(self, cle: str, chemin_sortie: str) -> None:
+        """
+        Ajoute le résultat 'chemin_sortie' au cache puis applique la taille maximale.
+        """
+        final = self.chemin(cle)
+        temporaire = f"{final}.{os.getpid()}.tmp"  # Rendu visible d'un coup par os.replace
+        self.placer(chemin_sortie, temporaire)
+        os.replace(temporaire, final)
+        os.utime(final)
+        self.evincer()
+
+    def evincer(self) -> None:
+        entrees = []
+        total = 0
+        with os.scandir(self.dossier) as it:
+            for e in it:
+                if e.name.endswith(EXTENSION_CACHE):
+                    infos = e.stat()
+                    entrees.append((infos.st_mtime, infos.st_size, e.path))
+                    total += infos.st_size
+        entrees.sort()  # Des moins récemment utilisées aux plus récentes
+        for _, taille, chemin in entrees:
+            if total <= self.taille_max:
+                break
+            try:
+                os.remove(chemin)
+            except FileNotFoundError:  # Déjà évincée par un autre processus
+                pass
+            total -= taille
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+
+import aha_et_utils
+from serveur_compression import (
+    ADRESSE_HOTE_DEFAUT,
+    OP_COMPRESSION,
+    OP_DECOMPRESSION,
+    OP_STATISTIQUES,
+    PORT_DEFAUT,
+    STATUT_OK,
+    TAILLE_BLOC_LECTURE,
+    TAILLE_ENTETE_MESSAGE,
+    entete_message,
+)
+
+"""
+Petit client du serveur de compression, à utiliser à la place de ./compresser et ./decompresser.
+"""
+
+
+class ClientCompression:
+    """
+    Connexion persistante au serveur : plusieurs requêtes passent par la même socket.
+    'adresse' est soit le chemin d'une socket Unix, soit un couple (hôte, port).
+    """
+
+    def __init__(self, adresse=(ADRESSE_HOTE_DEFAUT, PORT_DEFAUT)):
+        if isinstance(adresse, str):
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.connect(adresse)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def fermer(self) -> None:
+        self.socket.close()
+
+    def lire_exactement(self, n: int) -> bytes:
+        morceaux = []
+        restant = n
+        while restant > 0:
+            morceau = self.socket.recv(min(TAILLE_BLOC_LECTURE, restant))
+            if not morceau:
+                raise ConnectionError("Connexion fermée par le serveur")
+            morceaux.append(morceau)
+            restant -= len(morceau)
+        return b"".join(morceaux)
+
+    def requete(self, operation: bytes, donnees: bytes = b"") -> bytes:
+        """
+        Envoie une requête et renvoie les données de la réponse.
+        Lève RuntimeError si le serveur signale une erreur.
+        """
+        try:
+            self.socket.sendall(entete_message(operation, len(donnees)))
+            self.socket.sendall(donnees)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Requête refusée : le serveur a répondu puis coupé sans lire les données
+
+        entete = self.lire_exactement(TAILLE_ENTETE_MESSAGE)
+        statut = entete[:1]
+        longueur = int.from_bytes(entete[1:], "big")
+        reponse = self.lire_exactement(longueur)
+        if statut != STATUT_OK:
+            raise RuntimeError(f"Erreur du serveur : {reponse.decode('utf-8', errors='replace')}")
+        return reponse
+
+    def compresser(self, donnees: bytes) -> bytes:
+        return self.requete(OP_COMPRESSION, donnees)
+
+    def decompresser(self, donnees: bytes) -> bytes:
+        return self.requete(OP_DECOMPRESSION, donnees)
+
+    def statistiques(self) -> dict:
+        return json.loads(self.requete(OP_STATISTIQUES).decode("utf-8"))
+
+    def compresser_fichier(self, chemin_entree: str, chemin_sortie: str) -> None:
+        """
+        Équivalent de ./compresser via le serveur (registre mis à jour comme avant).
+        """
+        debut = time.perf_counter()
+        with open(chemin_entree, "rb") as fin:
+            resultat = self.compresser(fin.read())
+        # Remplacée et non réécrite en place : la sortie peut être un lien dur vers le cache de ./compresser
+        temporaire = f"{chemin_sortie}.{os.getpid()}.tmp"
+        with open(temporaire, "wb") as fout:
+            fout.write(resultat)
+        os.replace(temporaire, chemin_sortie)
+        duree = int((time.perf_counter() - debut) * 1000)
+        aha_et_utils.mettre_a_jour_registre_compression(chemin_entree, chemin_sortie, duree)
+
+    def decompresser_fichier(self, chemin_entree: str, chemin_sortie: str) -> None:
+        """
+        Équivalent de ./decompresser via le serveur.
+        """
+        debut = time.perf_counter()
+        with open(chemin_entree, "rb") as fin:
+            resultat = self.decompresser(fin.read())
+        with open(chemin_sortie, "wb") as fout:
+            fout.write(resultat)
+        duree = int((time.perf_counter() - debut) * 1000)
+        aha_et_utils.mettre_a_jour_registre_decompression(chemin_entree, chemin_sortie, duree)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Client du serveur de compression AHA.")
+    parser.add_argument("operation", choices=["compresser", "decompresser", "stats"])
+    parser.add_argument("entree", nargs="?", help="Fichier d'entrée")
+    parser.add_argument("sortie", nargs="?", help="Fichier de sortie")
+    parser.add_argument("--unix", type=str, default="", help="Chemin de la socket Unix du serveur")
+    parser.add_argument("--hote", type=str, default=ADRESSE_HOTE_DEFAUT)
+    parser.add_argument("--port", type=int, default=PORT_DEFAUT)
+    args = parser.parse_args()
+
+    adresse = args.unix if args.unix else (args.hote, args.port)
+
+    if args.operation != "stats" and (args.entree is None or args.sortie is None):
+        print(f"Usage : {sys.argv[0]} {args.operation} <fichier_entree> <fichier_sortie>")
+        sys.exit(1)
+    if args.operation != "stats" and not os.path.exists(args.entree):
+        print(f"Erreur : le fichier d'entrée '{args.entree}' n'existe pas.")
+        sys.exit(1)
+
+    try:
+        with ClientCompression(adresse) as client:
+            if args.operation == "compresser":
+                client.compresser_fichier(args.entree, args.sortie)
+                print(f"Compression terminée : '{args.entree}' → '{args.sortie}'")
+            elif args.operation == "decompresser":
+                client.decompresser_fichier(args.entree, args.sortie)
+                print(f"Décompression terminée : '{args.entree}' → '{args.sortie}'")
+            else:
+                print(json.dumps(client.statistiques(), indent=2))
+    except (OSError, RuntimeError) as e:
+        print(f"Erreur : {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,38 +2,38 @@
 import sys
 import os
 import time
+import argparse
 import aha_et_utils
+import cache_compression
+import modele_blocs
+import modele_continu
+import modele_mots
+import modele_ordre1
+import pipeline
+import profileur
 import texte_utils
 
 
-def compresser_fichier(chemin_entree: str, chemin_sortie: str) -> None:
+def compresser_flux(fin, fout, mode: int = texte_utils.MODE_CARACTERE,
+                    budget_kio: int = modele_ordre1.BUDGET_KIO_DEFAUT) -> None:
     """
-    Lit 'chemin_entree' en binaire, octet par octet, puis bit par bit,
-    compresse en bits (algo de compression dans la boucle centrale)
-    et écrit dans 'chemin_sortie' un fichier binaire .huff avec :
-
-        [8 octets en-tête = nb_bits utiles (entier 64 bits, big-endian)]
-        [flux de bits compressés, complété par du padding de 0 jusqu'à l'octet]
+    Cœur de la compression : lit le flux binaire 'fin' et écrit dans 'fout'
+    (flux binaire positionnable) l'en-tête puis le flux de bits compressés.
+    'budget_kio' borne la mémoire du pool de contextes en mode ordre 1.
+    Lève ValueError si le texte contient "ᛃ" en mode caractère.
     """
-    # Vérifier que le fichier d'entrée existe
-    if not os.path.exists(chemin_entree):
-        print(f"Erreur : le fichier d'entrée '{chemin_entree}' n'existe pas.")
-        sys.exit(1)
-
-    # Ouvrir le fichier d'entrée en lecture binaire
-    try:
-        fin = open(chemin_entree, "rb")
-    except OSError as e:
-        print(f"Erreur à l'ouverture de '{chemin_entree}' en lecture : {e}")
-        sys.exit(1)
-
-    # Ouvrir le fichier de sortie en binaire, en l'écrasant
-    try:
-        fout = open(chemin_sortie, "wb")
-    except OSError as e:
-        fin.close()
-        print(f"Erreur à l'ouverture de '{chemin_sortie}' en écriture binaire : {e}")
-        sys.exit(1)
+    if mode == texte_utils.MODE_ORDRE1:
+        modele_ordre1.compresser_flux_ordre1(fin, fout, budget_kio)
+        return
+    if mode == texte_utils.MODE_MOTS:
+        modele_mots.compresser_flux_mots(fin, fout)
+        return
+    if mode == texte_utils.MODE_BLOCS:
+        modele_blocs.compresser_flux_blocs(fin, fout)
+        return
+    if mode == texte_utils.MODE_CONTINU:
+        modele_continu.compresser_flux_continu(fin, fout)
+        return
 
     # On réserve huit octets pour l'en-tête (nb_bits). On met 0 pour l'instant.
     fout.write(b"\x00" * 8)
@@ -45,8 +45,6 @@ def compresser_fichier(chemin_entree: str, chemin_sortie: str) -> None:
         "nb_bits": 0,  # Nombre de bits UTILES écrits (sans le padding)
     }
 
-    debut = time.perf_counter()
-
     bits = ""
     arbre = aha_et_utils.AHA()  # Initialise un arbre avec dièse / NYT
 
@@ -56,60 +54,62 @@ def compresser_fichier(chemin_entree: str, chemin_sortie: str) -> None:
 
     # ---------------  BOUCLE PRINCIPALE ---------------
     # Lecture binaire, octet par octet, puis bit par bit ---
-    try:
-        while True:
-            chunk = fin.read(1)  # <<< lecture octet par octet
-            if not chunk:
-                break
-
-            byte = chunk[0]  # Entier 0–255
-
-            # Pour chaque octet, on lit les 8 bits (MSB -> LSB)
-            for bit_index in range(7, -1, -1):
-                bit_val = (byte >> bit_index) & 1
-
-                bit = "1" if bit_val == 1 else "0"  # Un bit en str
-                buffer += bit
-                if texte_utils.is_single_utf8_char(
-                    buffer
-                ):  # La suite de bits dans buffer représente un caractère utf 8
-                    ch = texte_utils.bits_to_char(buffer)
-                    buffer = ""
-
-                    if ch in table_correspondance:  # On a déjà vu le caractère
-
-                        bits += arbre.encodage_caractere_arbre(
-                            ch
-                        )  # On utilise son codage compressé
+    while True:
+        chunk = fin.read(1)  # <<< lecture octet par octet
+        if not chunk:
+            break
+
+        byte = chunk[0]  # Entier 0–255
+
+        # Pour chaque octet, on lit les 8 bits (MSB -> LSB)
+        for bit_index in range(7, -1, -1):
+            bit_val = (byte >> bit_index) & 1
+
+            bit = "1" if bit_val == 1 else "0"  # Un bit en str
+            buffer += bit
+            if texte_utils.is_single_utf8_char(
+                buffer
+            ):  # La suite de bits dans buffer représente un caractère utf 8
+                ch = texte_utils.bits_to_char(buffer)
+                buffer = ""
+
+                if ch == "ᛃ":  # Le format historique réserve ce caractère au dièze
+                    raise ValueError(
+                        "Le mode caractère ne gère pas le caractère U+16C3 'ᛃ' (réservé au dièze) : "
+                        "utilisez --continu, --blocs, --ordre1 ou --mots."
+                    )
+
+                if ch in table_correspondance:  # On a déjà vu le caractère
+
+                    bits += arbre.encodage_caractere_arbre(
+                        ch
+                    )  # On utilise son codage compressé
 
-                    else:  # Caractère nouveau
+                else:  # Caractère nouveau
 
-                        bits += table_correspondance[
-                            "ᛃ"
-                        ]  # Transmet le caractère spécial
+                    bits += table_correspondance[
+                        "ᛃ"
+                    ]  # Transmet le caractère spécial
 
-                        bits += texte_utils.char_to_bits(ch)  # Ajoute l'encodage utf 8
+                    bits += texte_utils.char_to_bits(ch)  # Ajoute l'encodage utf 8
 
-                    arbre.modification(ch)  # Actualise l'arbre
+                arbre.modification(ch)  # Actualise l'arbre
 
-                    table_correspondance[ch] = arbre.encodage_caractere_arbre(
-                        ch
-                    )  # Actualise la table
+                table_correspondance[ch] = arbre.encodage_caractere_arbre(
+                    ch
+                )  # Actualise la table
 
-                    table_correspondance["ᛃ"] = arbre.encodage_caractere_arbre(
-                        "ᛃ"
-                    )  # Actualise la table pour le caractère spécial
+                table_correspondance["ᛃ"] = arbre.encodage_caractere_arbre(
+                    "ᛃ"
+                )  # Actualise la table pour le caractère spécial
 
-                    if bits:
-                        texte_utils.ecrire_bits(
-                            fout, bits, etat
-                        )  # Écrits dans le fichier
-                        bits = ""
+                if bits:
+                    texte_utils.ecrire_bits(
+                        fout, bits, etat
+                    )  # Écrits dans le fichier
+                    bits = ""
     # --------------- FIN BOUCLE ---------------
 
-    finally:
-        fin.close()
-
     # --- Padding : compléter le dernier octet avec des '0' si besoin ---
     if etat["bit_pos"] > 0:
         # On décale les bits restants vers la gauche pour remplir l'octet
@@ -124,25 +124,140 @@ def compresser_fichier(chemin_entree: str, chemin_sortie: str) -> None:
     # Écrit nb_bits sur 8 octets (entier 64 bits, big-endian)
     fout.write(nb_bits.to_bytes(8, byteorder="big"))
 
-    fout.close()
+
+def compresser_fichier(chemin_entree: str, chemin_sortie: str, mode: int = texte_utils.MODE_CARACTERE,
+                       budget_kio: int = modele_ordre1.BUDGET_KIO_DEFAUT, cache=None,
+                       en_pipeline: bool = False) -> None:
+    """
+    Lit 'chemin_entree' en binaire, octet par octet, puis bit par bit,
+    compresse en bits (algo de compression dans la boucle centrale)
+    et écrit dans 'chemin_sortie' un fichier binaire .huff avec :
+
+        [8 octets en-tête = mode (octet de poids fort) + nb_bits utiles (big-endian)]
+        [flux de bits compressés, complété par du padding de 0 jusqu'à l'octet]
+    """
+    # Vérifier que le fichier d'entrée existe
+    if not os.path.exists(chemin_entree):
+        print(f"Erreur : le fichier d'entrée '{chemin_entree}' n'existe pas.")
+        sys.exit(1)
+
+    debut = time.perf_counter()
+
+    # Cache (cache_compression.CacheCompression) : une entrée déjà vue coûte une empreinte et une copie
+    if cache is not None:
+        parametres = f"-b{budget_kio}" if mode == texte_utils.MODE_ORDRE1 else ""
+        cle = cache.cle(chemin_entree, mode, parametres)
+        if cache.recuperer(cle, chemin_sortie):
+            duree = int((time.perf_counter() - debut) * 1000)
+            aha_et_utils.mettre_a_jour_registre_compression(chemin_entree, chemin_sortie, duree, "hit")
+            print(f"Compression terminée (cache) : '{chemin_entree}' → '{chemin_sortie}'")
+            return
+
+    # Ouvrir le fichier d'entrée en lecture binaire
+    try:
+        fin = open(chemin_entree, "rb")
+    except OSError as e:
+        print(f"Erreur à l'ouverture de '{chemin_entree}' en lecture : {e}")
+        sys.exit(1)
+
+    # On écrit dans un fichier temporaire voisin, qui remplace la sortie par os.replace à la fin.
+    # La sortie existante n'est jamais réécrite en place : ce peut être un lien dur vers une entrée
+    # du cache (run précédent avec --cache-liens), que l'on corromprait même sans --cache.
+    temporaire = f"{chemin_sortie}.{os.getpid()}.tmp"
+    try:
+        fout = open(temporaire, "wb")
+    except OSError as e:
+        fin.close()
+        print(f"Erreur à l'ouverture de '{temporaire}' en écriture binaire : {e}")
+        sys.exit(1)
+
+    try:
+        try:
+            # en_pipeline : lecture anticipée et écriture différée dans des fils séparés
+            with pipeline.etages(fin, fout, en_pipeline) as (flux_entree, flux_sortie):
+                compresser_flux(flux_entree, flux_sortie, mode, budget_kio)
+        finally:
+            fin.close()
+            fout.close()
+        os.replace(temporaire, chemin_sortie)
+    except ValueError as e:  # Texte refusé par le mode : pas de sortie partielle
+        os.remove(temporaire)
+        print(f"Erreur : {e}")
+        sys.exit(1)
+    except BaseException:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+
+    if cache is not None:
+        cache.stocker(cle, chemin_sortie)
+
     duree = int((time.perf_counter() - debut) * 1000)  # * 1000 pour les millisecondes
 
     # Mise à jour du registre comme avant
-    aha_et_utils.mettre_a_jour_registre_compression(chemin_entree, chemin_sortie, duree)
+    aha_et_utils.mettre_a_jour_registre_compression(
+        chemin_entree, chemin_sortie, duree, "miss" if cache is not None else ""
+    )
 
     print(f"Compression terminée : '{chemin_entree}' → '{chemin_sortie}'")
 
 
 def main():
-    if len(sys.argv) != 3:  # Vérification de nb d'arguments
-        print(f"Usage : {sys.argv[0]} <fichier_entree.txt> <fichier_sortie.huff>")
-        sys.exit(1)
-
-    # Récupération des arguments
-    chemin_entree = sys.argv[1]
-    chemin_sortie = sys.argv[2]
-
-    compresser_fichier(chemin_entree, chemin_sortie)
+    parser = argparse.ArgumentParser(description="Compression AHA d'un fichier texte UTF-8.")
+    parser.add_argument("entree", help="Fichier d'entrée (.txt)")
+    parser.add_argument("sortie", help="Fichier de sortie (.huff)")
+    parser.add_argument("--ordre1", action="store_true",
+                        help="Modélisation d'ordre 1 (un arbre par caractère précédent)")
+    parser.add_argument("--mots", action="store_true",
+                        help="Symboles = mots, espaces et ponctuation (taux, pas débit : vocabulaire répétitif)")
+    parser.add_argument("--blocs", action="store_true",
+                        help="Choix par bloc entre stockage, Huffman statique et AHA (jamais plus gros que l'entrée)")
+    parser.add_argument("--continu", action="store_true",
+                        help="Segments décodables au fil de l'eau (voir modele_continu.py pour les flux vivants)")
+    parser.add_argument("--budget-kio", type=int, default=modele_ordre1.BUDGET_KIO_DEFAUT,
+                        help="[--ordre1] Mémoire maximale du pool de contextes, en Kio")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile l'exécution (piles repliées dans <sortie>.profil.folded)")
+    parser.add_argument("--memoire", action="store_true",
+                        help="Affiche le pic de mémoire Python (tracemalloc) et le RSS maximal")
+    parser.add_argument("--cache", action="store_true",
+                        help="Réutilise les résultats déjà calculés pour un contenu identique")
+    parser.add_argument("--cache-dossier", default=cache_compression.DOSSIER_CACHE_DEFAUT, metavar="DOSSIER",
+                        help="[--cache] Dossier du cache")
+    parser.add_argument("--cache-mio", type=int, default=cache_compression.TAILLE_CACHE_MIO_DEFAUT,
+                        help="[--cache] Taille maximale du cache, en Mio (éviction LRU)")
+    parser.add_argument("--cache-liens", action="store_true",
+                        help="[--cache] Sorties en liens durs vers le cache (à ne pas modifier en place)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Lecture et écriture dans des fils séparés, en parallèle du codage")
+    args = parser.parse_args()
+
+    if args.ordre1 + args.mots + args.blocs + args.continu > 1:
+        parser.error("--ordre1, --mots, --blocs et --continu sont incompatibles")
+    if args.profile and args.memoire:
+        parser.error("--profile et --memoire sont incompatibles (tracemalloc fausserait le profil)")
+    if args.ordre1:
+        mode = texte_utils.MODE_ORDRE1
+    elif args.mots:
+        mode = texte_utils.MODE_MOTS
+    elif args.blocs:
+        mode = texte_utils.MODE_BLOCS
+    elif args.continu:
+        mode = texte_utils.MODE_CONTINU
+    else:
+        mode = texte_utils.MODE_CARACTERE
+    cache = None
+    if args.cache:
+        cache = cache_compression.CacheCompression(args.cache_dossier, args.cache_mio, args.cache_liens)
+    if args.profile:
+        profileur.executer_avec_profil(compresser_fichier, args.sortie,
+                                       args.entree, args.sortie, mode, args.budget_kio, cache,
+                                       args.pipeline)
+    elif args.memoire:
+        profileur.executer_avec_memoire(compresser_fichier, args.entree, args.sortie, mode, args.budget_kio,
+                                        cache, args.pipeline)
+    else:
+        compresser_fichier(args.entree, args.sortie, mode, args.budget_kio, cache, args.pipeline)
 
 
 if __name__ == "__main__":
@@ -2,14 +2,180 @@
 import sys
 import os
 import time
+import argparse
+import io
 import aha_et_utils
+import modele_blocs
+import modele_continu
+import modele_mots
+import modele_ordre1
+import pipeline
+import profileur
 import texte_utils
 
 
-TAILLE_ENTETE_OCTETS = 8  # nombre de bits utiles stocké sur 8 octets
+TAILLE_ENTETE_OCTETS = texte_utils.TAILLE_ENTETE_OCTETS  # mode + nombre de bits utiles sur 8 octets
 
 
-def decomprimer_fichier(chemin_entree: str, chemin_sortie: str) -> None:
+def decomprimer_flux(fichier_entree, fichier_sortie) -> None:
+    """
+    Cœur de la décompression : lit le flux binaire compressé 'fichier_entree'
+    et écrit le texte décodé dans le flux texte 'fichier_sortie'
+    (un flux binaire en mode blocs, voir sortie_binaire).
+    Lève ValueError si l'en-tête est invalide.
+    """
+    # Lecture de l'en-tête : mode et nombre de bits utiles
+    entete = fichier_entree.read(TAILLE_ENTETE_OCTETS)
+    mode, nb_bits_utiles = texte_utils.lire_entete(entete)
+
+    if mode == texte_utils.MODE_ORDRE1:
+        modele_ordre1.decomprimer_flux_ordre1(fichier_entree, fichier_sortie, nb_bits_utiles)
+        return
+    if mode == texte_utils.MODE_MOTS:
+        modele_mots.decomprimer_flux_mots(fichier_entree, fichier_sortie, nb_bits_utiles)
+        return
+    if mode == texte_utils.MODE_BLOCS:
+        # En mode blocs, les 7 octets bas de l'en-tête donnent la taille d'origine
+        modele_blocs.decomprimer_flux_blocs(fichier_entree, fichier_sortie, nb_bits_utiles)
+        return
+    if mode == texte_utils.MODE_CONTINU:
+        modele_continu.decomprimer_flux_continu(fichier_entree, fichier_sortie)
+        return
+
+    if nb_bits_utiles == 0:  # Texte vide : pas même le dièze initial
+        return
+
+    lecteur_bits = texte_utils.LecteurBits(fichier_entree, nb_bits_utiles)
+
+    arbre = aha_et_utils.AHA()  # Initialise un arbre avec dieze
+
+    noeud = arbre.racine  # On commence le parcours depuis la racine
+    texte_init = ""  # Sert quand on vient de rencontrer un dieze
+
+    test = (
+        lecteur_bits.lire_bit()
+    )  # Lit le premier bit qui est nécessairement un dièze donc 0
+    post_dieze = True  # Cas du caractère succédant à #
+    en_cours_de_parcours = False  # Indique dans la boucle si on doit rechercher dans l'arborescence
+    caractere_trouve = (
+        False  # Indique dans la boucle si on a trouvé un caractere dans l'arbre
+    )
+    if test != 0:
+        print("Erreur ne commence pas par le caractère spécial")
+    while True:
+        bit = lecteur_bits.lire_bit()
+
+        if en_cours_de_parcours:
+            # Recherche un caractere en suivant l'arbre selon le flux de bits
+            if noeud is None:
+                print("Erreur : on a pas une feuille")
+
+            if bit == 1:
+                if noeud.fd is None:  # On est au bout
+
+                    en_cours_de_parcours = False
+                    caractere_trouve = True
+                else:
+
+                    noeud = noeud.fd
+                    continue
+            elif bit == 0:
+                if noeud.fg is None:  # On est au bout
+                    en_cours_de_parcours = False
+                    caractere_trouve = True
+
+                else:
+                    noeud = noeud.fg
+
+                    continue
+
+            else:  # N'arrive qu'en fin de parcours
+                pass
+
+        if caractere_trouve:
+            caracterecorrespondant = noeud.caractere
+
+            noeud = arbre.racine  # On recommence le parcours depuis la racine
+
+            if caracterecorrespondant == "ᛃ":  # On ne va pas écrire # dans le fichier
+                post_dieze = True  # Pour le prochain tour de boucle, on ira chercher dans le codage utf8
+                en_cours_de_parcours = False
+
+            else:  # On écrit le caractere en utf8
+                fichier_sortie.write(
+                    caracterecorrespondant
+                )  # Écrit dans le fichier
+                arbre.modification(
+                    caracterecorrespondant
+                )  # On actualise l'arbre
+                en_cours_de_parcours = True  # Indique dans la boucle si on doit rechercher dans l'arborescence
+                post_dieze = False  # Au cas ou
+
+                # On parcourt l'arbre avec le caractère courant
+                if noeud is None:
+                    print("Erreur : on a pas une feuille")
+
+                if bit == 1:
+                    noeud = noeud.fd  # On va à droite
+
+                elif bit == 0:
+                    noeud = noeud.fg  # On va à gauche
+
+            caractere_trouve = False  # Indique qu'il faudra chercher un caractère dans la prochaine itération
+
+        if post_dieze:  # Le caractère précédent était un dièze
+            texte_init += str(bit)  # "Enmagasine" les bits jusqu'à avoir un utf8
+
+            if texte_utils.is_single_utf8_char(
+                texte_init
+            ):  # La suite de bits dans le texte init représente un caractère utf-8
+
+                caracterecorrespondant = texte_utils.bits_to_char(texte_init)
+                fichier_sortie.write(caracterecorrespondant)  # Écrit dans le fichier
+                arbre.modification(caracterecorrespondant)  # On actualise l'arbre
+                post_dieze = False
+                en_cours_de_parcours = True  # Indique dans la boucle si on doit rechercher dans l'arborescence
+                caractere_trouve = False  # Indique dans la boucle si on a trouvé un caractere dans l'arbre
+                noeud = arbre.racine  # On commence le parcours depuis la racine
+                texte_init = ""  # Vide pour la suite
+
+        if bit is None:  # Il n'y a plus rien à lire
+            break
+
+    caracterecorrespondant = noeud.caractere
+    if caracterecorrespondant != "vide":  # Évite un bug
+        fichier_sortie.write(
+            caracterecorrespondant
+        )  # Écrit dans le fichier le dernier caractère stocké
+
+
+def sortie_binaire(entete: bytes) -> bool:
+    """
+    Indique si un fichier compressé d'en-tête 'entete' se décode vers un flux binaire :
+    en mode blocs, les blocs stockés peuvent contenir des octets quelconques
+    (données aléatoires, déjà compressées...) qui ne sont pas du texte UTF-8.
+    Lève ValueError si l'en-tête est invalide.
+    """
+    mode, _ = texte_utils.lire_entete(entete)
+    return mode == texte_utils.MODE_BLOCS
+
+
+def decomprimer_octets(donnees: bytes) -> bytes:
+    """
+    Décompresse 'donnees' en mémoire et renvoie les octets d'origine
+    (le texte encodé en UTF-8, sauf en mode blocs où les octets sont rendus tels quels).
+    """
+    fichier_entree = io.BytesIO(donnees)
+    if sortie_binaire(donnees[:TAILLE_ENTETE_OCTETS]):
+        fichier_sortie = io.BytesIO()
+        decomprimer_flux(fichier_entree, fichier_sortie)
+        return fichier_sortie.getvalue()
+    fichier_sortie = io.StringIO(newline="")
+    decomprimer_flux(fichier_entree, fichier_sortie)
+    return fichier_sortie.getvalue().encode("utf-8")
+
+
+def decomprimer_fichier(chemin_entree: str, chemin_sortie: str, en_pipeline: bool = False) -> None:
     """
     Décompression en flux
     – Lit le .huff binaire
@@ -22,118 +188,19 @@ def decomprimer_fichier(chemin_entree: str, chemin_sortie: str) -> None:
 
     debut = time.perf_counter()
 
-    with open(chemin_entree, "rb") as fichier_entree:
-        # Lecture de l'en-tête : nombre de bits utiles
-        entete = fichier_entree.read(TAILLE_ENTETE_OCTETS)
-        if len(entete) != TAILLE_ENTETE_OCTETS:
-            print("Fichier compressé invalide : en-tête manquante ou incomplète.")
-            sys.exit(1)
-
-        nb_bits_utiles = int.from_bytes(entete, "big")
-        lecteur_bits = texte_utils.LecteurBits(fichier_entree, nb_bits_utiles)
-
-        # On écrase le fichier de sortie.
-        with open(chemin_sortie, "w", encoding="utf-8") as fichier_sortie:
-            arbre = aha_et_utils.AHA()  # Initialise un arbre avec dieze
-
-            noeud = arbre.racine  # On commence le parcours depuis la racine
-            texte_init = ""  # Sert quand on vient de rencontrer un dieze
-
-            test = (
-                lecteur_bits.lire_bit()
-            )  # Lit le premier bit qui est nécessairement un dièze donc 0
-            post_dieze = True  # Cas du caractère succédant à #
-            en_cours_de_parcours = False  # Indique dans la boucle si on doit rechercher dans l'arborescence
-            caractere_trouve = (
-                False  # Indique dans la boucle si on a trouvé un caractere dans l'arbre
-            )
-            if test != 0:
-                print("Erreur ne commence pas par le caractère spécial")
-            while True:
-                bit = lecteur_bits.lire_bit()
-
-                if en_cours_de_parcours:
-                    # Recherche un caractere en suivant l'arbre selon le flux de bits
-                    if noeud is None:
-                        print("Erreur : on a pas une feuille")
-
-                    if bit == 1:
-                        if noeud.fd is None:  # On est au bout
-
-                            en_cours_de_parcours = False
-                            caractere_trouve = True
-                        else:
-
-                            noeud = noeud.fd
-                            continue
-                    elif bit == 0:
-                        if noeud.fg is None:  # On est au bout
-                            en_cours_de_parcours = False
-                            caractere_trouve = True
-
-                        else:
-                            noeud = noeud.fg
-
-                            continue
-
-                    else:  # N'arrive qu'en fin de parcours
-                        pass
-
-                if caractere_trouve:
-                    caracterecorrespondant = noeud.caractere
-
-                    noeud = arbre.racine  # On recommence le parcours depuis la racine
-
-                    if caracterecorrespondant == "ᛃ":  # On ne va pas écrire # dans le fichier
-                        post_dieze = True  # Pour le prochain tour de boucle, on ira chercher dans le codage utf8
-                        en_cours_de_parcours = False
-
-                    else:  # On écrit le caractere en utf8
-                        fichier_sortie.write(
-                            caracterecorrespondant
-                        )  # Écrit dans le fichier
-                        arbre.modification(
-                            caracterecorrespondant
-                        )  # On actualise l'arbre
-                        en_cours_de_parcours = True  # Indique dans la boucle si on doit rechercher dans l'arborescence
-                        post_dieze = False  # Au cas ou
-
-                        # On parcourt l'arbre avec le caractère courant
-                        if noeud is None:
-                            print("Erreur : on a pas une feuille")
-
-                        if bit == 1:
-                            noeud = noeud.fd  # On va à droite
-
-                        elif bit == 0:
-                            noeud = noeud.fg  # On va à gauche
-
-                    caractere_trouve = False  # Indique qu'il faudra chercher un caractère dans la prochaine itération
-
-                if post_dieze:  # Le caractère précédent était un dièze
-                    texte_init += str(bit)  # "Enmagasine" les bits jusqu'à avoir un utf8
-
-                    if texte_utils.is_single_utf8_char(
-                        texte_init
-                    ):  # La suite de bits dans le texte init représente un caractère utf-8
-
-                        caracterecorrespondant = texte_utils.bits_to_char(texte_init)
-                        fichier_sortie.write(caracterecorrespondant)  # Écrit dans le fichier
-                        arbre.modification(caracterecorrespondant)  # On actualise l'arbre
-                        post_dieze = False
-                        en_cours_de_parcours = True  # Indique dans la boucle si on doit rechercher dans l'arborescence
-                        caractere_trouve = False  # Indique dans la boucle si on a trouvé un caractere dans l'arbre
-                        noeud = arbre.racine  # On commence le parcours depuis la racine
-                        texte_init = ""  # Vide pour la suite
-
-                if bit is None:  # Il n'y a plus rien à lire
-                    break
-
-            caracterecorrespondant = noeud.caractere
-            if caracterecorrespondant != "vide":  # Évite un bug
-                fichier_sortie.write(
-                    caracterecorrespondant
-                )  # Écrit dans le fichier le dernier caractère stocké
+    try:
+        with open(chemin_entree, "rb") as fichier_entree:
+            binaire = sortie_binaire(fichier_entree.read(TAILLE_ENTETE_OCTETS))
+            fichier_entree.seek(0)
+            # On écrase le fichier de sortie.
+            with (open(chemin_sortie, "wb") if binaire
+                  else open(chemin_sortie, "w", encoding="utf-8")) as fichier_sortie:
+                # en_pipeline : lecture anticipée et écriture différée dans des fils séparés
+                with pipeline.etages(fichier_entree, fichier_sortie, en_pipeline) as (flux_entree, flux_sortie):
+                    decomprimer_flux(flux_entree, flux_sortie)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
 
     duree = int((time.perf_counter() - debut) * 1000)  # Pour le temps en ms
 
@@ -142,17 +209,33 @@ def decomprimer_fichier(chemin_entree: str, chemin_sortie: str) -> None:
 
 
 def main():
-    if len(sys.argv) != 3:
-        print(f"Usage : {sys.argv[0]} <fichier_entree.huff> <fichier_sortie.txt>")
-        sys.exit(1)
-
-    chemin_entree = sys.argv[1]
-    chemin_sortie = sys.argv[2]
+    parser = argparse.ArgumentParser(description="Décompression d'un fichier .huff.")
+    parser.add_argument("entree", help="Fichier compressé (.huff)")
+    parser.add_argument("sortie", help="Fichier de sortie (.txt)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile l'exécution (piles repliées dans <sortie>.profil.folded)")
+    parser.add_argument("--memoire", action="store_true",
+                        help="Affiche le pic de mémoire Python (tracemalloc) et le RSS maximal")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Lecture et écriture dans des fils séparés, en parallèle du décodage")
+    args = parser.parse_args()
+
+    if args.profile and args.memoire:
+        parser.error("--profile et --memoire sont incompatibles (tracemalloc fausserait le profil)")
+
+    chemin_entree = args.entree
+    chemin_sortie = args.sortie
 
     if os.path.exists(chemin_sortie):
         os.remove(chemin_sortie)
 
-    decomprimer_fichier(chemin_entree, chemin_sortie)
+    if args.profile:
+        profileur.executer_avec_profil(decomprimer_fichier, chemin_sortie,
+                                       chemin_entree, chemin_sortie, args.pipeline)
+    elif args.memoire:
+        profileur.executer_avec_memoire(decomprimer_fichier, chemin_entree, chemin_sortie, args.pipeline)
+    else:
+        decomprimer_fichier(chemin_entree, chemin_sortie, args.pipeline)
     return "Terminé"
 
 
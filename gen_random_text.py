@@ -1,5 +1,7 @@
 from __future__ import annotations
 import argparse
+import bisect
+import itertools
 import random
 from collections import Counter
 from typing import List
@@ -33,6 +35,16 @@ def categorical(choices: List[str], probs: List[float]) -> str:
 
     return choices[-1]
 
+def sample_text(choices: List[str], probs: List[float], N: int) -> str:
+    """
+    N tirages catégoriels, identiques à ceux de categorical() pour la même graine,
+    mais en O(log k) par tirage (recherche dichotomique dans les probabilités cumulées) :
+    indispensable pour les grands alphabets (dizaines de milliers de symboles).
+    """
+    cumul = list(itertools.accumulate(probs))
+    dernier = len(choices) - 1
+    return "".join(choices[min(bisect.bisect_left(cumul, random.random()), dernier)] for _ in range(N))
+
 def build_zipf_probs(k: int, s: float) -> List[float]:
     """
     Construit une distribution de type Zipf (loi de puissance).
@@ -66,26 +78,26 @@ def write_stats_csv(path: str, text: str) -> None:
 def generate_text_by_mode(mode: str, N: int, alphabet: List[str], weights: List[float] = None, zipf_s: float = 1.0) -> str:
     """
     Fonction qui génère le texte selon le mode spécifié.
-    Utilise categorical() pour la génération des caractères
+    Utilise sample_text() pour la génération des caractères
     """
     k = len(alphabet)
 
     if mode == "uniform":
         # Tous les caractères ont une probabilité égale
         probs = [1.0 / k] * k
-        text = "".join(categorical(alphabet, probs) for _ in range(N))
+        text = sample_text(alphabet, probs, N)
 
     elif mode == "weighted":
         # Utilise des poids fournis manuellement pour créer une asymétrie
         if weights is None or len(weights) != k:
             raise ValueError("Poids invalides ou manquants pour le mode pondéré.")
         probs = normalize(weights)
-        text = "".join(categorical(alphabet, probs) for _ in range(N))
+        text = sample_text(alphabet, probs, N)
 
     elif mode == "zipf":
         # Distribution de type loi de puissance
         probs = build_zipf_probs(k, zipf_s)
-        text = "".join(categorical(alphabet, probs) for _ in range(N))
+        text = sample_text(alphabet, probs, N)
 
     else:
         raise ValueError(f"Mode de génération inconnu ou non pris en charge: {mode}.")
@@ -128,7 +140,7 @@ def main():
     # -------------------------------------------------------------------------
     if args.mode == "uniform":
         probs = [1.0 / k] * k
-        text = "".join(categorical(alphabet, probs) for _ in range(N))
+        text = sample_text(alphabet, probs, N)
 
     elif args.mode == "weighted":
         if not args.weights:
@@ -142,14 +154,14 @@ def main():
             raise ValueError("len(weights) doit être égal à |alphabet|")
 
         probs = normalize(w)
-        text = "".join(categorical(alphabet, probs) for _ in range(N))
+        text = sample_text(alphabet, probs, N)
 
     elif args.mode == "zipf":
         if args.zipf_s <= 0:
             raise ValueError("--zipf_s doit être > 0")
 
         probs = build_zipf_probs(k, args.zipf_s)
-        text = "".join(categorical(alphabet, probs) for _ in range(N))
+        text = sample_text(alphabet, probs, N)
 
     # -------------------------------------------------------------------------
     # Sortie
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import argparse
+import io
+import sys
+import time
+import tracemalloc
+
+import aha_et_utils
+import compressor
+import decompressor
+import modele_mots
+import profileur
+import texte_utils
+
+"""
+Mesures mémoire de l'AHA et de la compression (tracemalloc + pic de RSS).
+
+    - octets par nœud de l'arbre (Noeud + entrée de 'nodes'), mesurés après construction ;
+    - allocations transitoires par symbole : pic de mémoire pendant modification()
+      au-dessus de ce qui reste alloué après ;
+    - pic de mémoire Python et RSS maximal pour chaque phase (lecture, compression, décompression).
+
+tracemalloc ralentit l'exécution (2 à 3 fois) : les durées affichées ici ne sont pas des débits.
+"""
+
+
+def mesurer_arbre(symboles, historique: bool = False) -> dict:
+    """
+    Construit un arbre AHA sur la suite 'symboles' sous tracemalloc.
+    """
+    symboles = list(symboles)  # Alloués avant la mesure : seul l'arbre est compté
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    arbre = aha_et_utils.AHA(historique)
+    transitoire_total = 0
+    transitoire_max = 0
+    for symbole in symboles:
+        tracemalloc.reset_peak()
+        arbre.modification(symbole)
+        courant, pic = tracemalloc.get_traced_memory()
+        transitoire_total += pic - courant
+        transitoire_max = max(transitoire_max, pic - courant)
+    courant, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nb_noeuds = arbre.nb_noeuds()
+    return {
+        "symboles": len(symboles),
+        "distincts": arbre.nb_symboles(),
+        "noeuds": nb_noeuds,
+        "octets_arbre": courant - base,
+        "octets_par_noeud": (courant - base) / nb_noeuds,
+        "transitoire_moyen": transitoire_total / max(len(symboles), 1),
+        "transitoire_max": transitoire_max,
+    }
+
+
+def symboles_du_mode(donnees: bytes, mode: int):
+    """
+    Renvoie (nom, symboles) : la suite de symboles que le mode donne à l'arbre AHA
+    (jetons pour le mode mots, caractères sinon).
+    """
+    if mode == texte_utils.MODE_MOTS:
+        return "jetons", list(modele_mots.lire_jetons(io.BytesIO(donnees)))
+    return "caractères", donnees.decode("utf-8")
+
+
+def mesurer_phases(donnees: bytes, mode: int = texte_utils.MODE_CARACTERE) -> list:
+    """
+    Compresse puis décompresse 'donnees' en mémoire et renvoie, pour chaque phase,
+    (nom, durée en s, pic tracemalloc en octets, RSS max en Kio).
+    """
+    phases = []
+    tracemalloc.start()
+
+    def phase(nom, fonction):
+        tracemalloc.reset_peak()
+        debut = time.perf_counter()
+        resultat = fonction()
+        _, pic = tracemalloc.get_traced_memory()
+        phases.append((nom, time.perf_counter() - debut, pic, profileur.rss_max_kio()))
+        return resultat
+
+    def compresser():
+        fout = io.BytesIO()
+        compressor.compresser_flux(io.BytesIO(donnees), fout, mode)
+        return fout.getvalue()
+
+    def decompresser(compresse):
+        return decompressor.decomprimer_octets(compresse).decode("utf-8")
+
+    try:
+        texte = phase("lecture (décodage UTF-8)", lambda: donnees.decode("utf-8"))
+        compresse = phase("compression", compresser)
+        resultat = phase("décompression", lambda: decompresser(compresse))
+    finally:
+        tracemalloc.stop()
+    if resultat != texte:
+        raise ValueError("La décompression ne redonne pas le texte d'origine.")
+    return phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapport mémoire de la compression AHA d'un texte.")
+    parser.add_argument("entree", help="Fichier texte UTF-8")
+    parser.add_argument("--mode", default=texte_utils.NOMS_MODES[texte_utils.MODE_CARACTERE],
+                        choices=list(texte_utils.NOMS_MODES.values()))
+    args = parser.parse_args()
+    mode = {nom: m for m, nom in texte_utils.NOMS_MODES.items()}[args.mode]
+
+    try:
+        with open(args.entree, "rb") as f:
+            donnees = f.read()
+        phases = mesurer_phases(donnees, mode)
+    except (OSError, ValueError) as e:
+        print(f"Erreur : {e}")
+        sys.exit(1)
+
+    print("| phase | durée (s) | pic Python (Kio) | RSS max (Mio) |")
+    print("|---|---|---|---|")
+    for nom, duree, pic, rss in phases:
+        print(f"| {nom} | {duree:.2f} | {pic / 1024:.1f} | {rss / 1024:.1f} |")
+
+    # Arbre d'ordre 0 sur les symboles du mode (moteur historique pour le mode caractère)
+    nom_symboles, symboles = symboles_du_mode(donnees, mode)
+    arbre = mesurer_arbre(symboles, historique=(mode == texte_utils.MODE_CARACTERE))
+    print()
+    print(f"Arbre : {arbre['distincts']} {nom_symboles} distincts, {arbre['noeuds']} nœuds, "
+          f"{arbre['octets_arbre'] / 1024:.1f} Kio, {arbre['octets_par_noeud']:.0f} octets/nœud")
+    print(f"Allocations transitoires par symbole ({arbre['symboles']} {nom_symboles}) : "
+          f"{arbre['transitoire_moyen']:.0f} octets en moyenne, "
+          f"{arbre['transitoire_max']} au plus")
+
+
+if __name__ == "__main__":
+    main()
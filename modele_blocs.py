@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import heapq
+import io
+import math
+from collections import Counter
+
+import aha_et_utils
+import texte_utils
+
+"""
+Mode « blocs » : l'entrée est découpée en blocs (coupés entre deux caractères UTF-8) et,
+pour chacun, on choisit la représentation la moins chère d'après ses fréquences :
+
+    - bloc stocké : les octets tels quels (données incompressibles : une simple copie) ;
+    - Huffman statique sur les octets : table canonique + codes ;
+    - AHA sur les caractères, avec un arbre neuf par bloc (blocs indépendants).
+
+La sortie ne dépasse jamais l'entrée de plus de 8 + 5 octets par bloc.
+
+Format :
+    [8 octets en-tête = mode blocs + taille d'origine en octets]
+    puis, pour chaque bloc, [1 octet type] suivi de :
+        stocké  : [4 octets n][n octets]
+        Huffman : [4 octets n][4 octets nb_bits][1 octet nb_symboles - 1]
+                  [(symbole, longueur) × nb_symboles][bits, padding de 0]
+        AHA     : [4 octets nb_bits][bits, padding de 0]
+"""
+
+TAILLE_BLOC_DEFAUT = 1 << 17  # 128 Kio
+BLOC_STOCKE = 0
+BLOC_HUFFMAN = 1
+BLOC_AHA = 2
+NOMS_BLOCS = {BLOC_STOCKE: "stocké", BLOC_HUFFMAN: "huffman", BLOC_AHA: "aha"}
+
+SEUIL_ENTROPIE_STOCKE = 7.9  # Bits par octet au-delà desquels on stocke sans essayer de coder
+GAIN_MINIMAL_AHA = 0.97  # L'AHA, bien plus lent, doit promettre au moins 3 % de mieux que Huffman
+TAILLE_ENTIER = 4
+
+
+def octets_vers_bits(octets: bytes, nb_bits: int) -> str:
+    if not octets:
+        return ""
+    return format(int.from_bytes(octets, "big"), f"0{8 * len(octets)}b")[:nb_bits]
+
+
+def coupure_utf8(donnees: bytes) -> int:
+    """
+    Position de coupure qui ne sépare pas les octets d'un caractère UTF-8 en fin de bloc.
+    """
+    for recul in range(1, min(4, len(donnees)) + 1):
+        octet = donnees[-recul]
+        if octet & 0xC0 != 0x80:  # Octet de tête (ou ASCII)
+            if octet < 0x80:
+                attendu = 1
+            elif octet >> 5 == 0b110:
+                attendu = 2
+            elif octet >> 4 == 0b1110:
+                attendu = 3
+            else:
+                attendu = 4
+            return len(donnees) - recul if attendu > recul else len(donnees)
+    return len(donnees)
+
+
+def lire_blocs(fin, taille_bloc: int = TAILLE_BLOC_DEFAUT):
+    """
+    Générateur des blocs d'octets de 'fin', coupés entre deux caractères quand le bloc
+    est de l'UTF-8 valide (sinon le bloc garde toute sa taille).
+    """
+    reste = b""
+    while True:
+        lu = fin.read(taille_bloc - len(reste))
+        donnees = reste + lu
+        if not donnees:
+            return
+        coupure = coupure_utf8(donnees) if lu else len(donnees)  # En fin de fichier on prend tout
+        if coupure < len(donnees):
+            try:
+                donnees[:coupure].decode("utf-8")
+            except UnicodeDecodeError:  # Données binaires : pas de caractère à préserver
+                coupure = len(donnees)
+        if coupure == 0:
+            coupure = len(donnees)
+        reste = donnees[coupure:]
+        yield donnees[:coupure]
+
+
+def entropie(frequences, total: int) -> float:
+    """
+    Entropie d'ordre 0, en bits par symbole.
+    """
+    return -sum(f * math.log2(f / total) for f in frequences) / total
+
+
+def longueurs_huffman(frequences: dict) -> dict:
+    """
+    Longueurs des codes de Huffman (statique) de chaque symbole.
+    """
+    if len(frequences) == 1:
+        return {symbole: 1 for symbole in frequences}
+    longueurs = dict.fromkeys(frequences, 0)
+    tas = [(f, i, [symbole]) for i, (symbole, f) in enumerate(frequences.items())]
+    heapq.heapify(tas)
+    compteur = len(tas)
+    while len(tas) > 1:
+        f1, _, groupe1 = heapq.heappop(tas)
+        f2, _, groupe2 = heapq.heappop(tas)
+        for symbole in groupe1 + groupe2:  # Chaque fusion allonge d'un bit les codes des deux groupes
+            longueurs[symbole] += 1
+        heapq.heappush(tas, (f1 + f2, compteur, groupe1 + groupe2))
+        compteur += 1
+    return longueurs
+
+
+def codes_canoniques(longueurs: dict) -> dict:
+    """
+    Codes canoniques : triés par (longueur, symbole), consécutifs à longueur égale.
+    Seules les longueurs sont donc à transmettre.
+    """
+    codes = {}
+    code = 0
+    longueur_prec = 0
+    for symbole, longueur in sorted(longueurs.items(), key=lambda x: (x[1], x[0])):
+        code <<= longueur - longueur_prec
+        codes[symbole] = format(code, f"0{longueur}b")
+        code += 1
+        longueur_prec = longueur
+    return codes
+
+
+def coder_huffman(bloc: bytes, longueurs: dict) -> bytes:
+    codes = codes_canoniques(longueurs)
+    table = [codes.get(octet) for octet in range(256)]
+    bits = "".join(map(table.__getitem__, bloc))
+    entete = len(bloc).to_bytes(TAILLE_ENTIER, "big") + len(bits).to_bytes(TAILLE_ENTIER, "big")
+    entete += bytes([len(longueurs) - 1])
+    entete += b"".join(bytes([symbole, longueur]) for symbole, longueur in sorted(longueurs.items()))
+    return entete + texte_utils.bits_vers_octets(bits)
+
+
+def coder_aha(texte: str) -> bytes:
+    arbre = aha_et_utils.AHA(historique=False)
+    bits = "".join(arbre.coder_caractere(ch) for ch in texte)  # Caractère nouveau dans le bloc : dièze + UTF-8
+    return len(bits).to_bytes(TAILLE_ENTIER, "big") + texte_utils.bits_vers_octets(bits)
+
+
+def estimer_aha(texte: str) -> int:
+    """
+    Taille estimée (octets) du bloc codé par l'AHA : entropie des caractères
+    plus le littéral UTF-8 de chaque caractère nouveau.
+    """
+    frequences = Counter(texte)
+    bits = entropie(frequences.values(), len(texte)) * len(texte)
+    bits += sum(8 * len(ch.encode("utf-8")) for ch in frequences)
+    return TAILLE_ENTIER + math.ceil(bits / 8)
+
+
+def choisir_et_coder(bloc: bytes):
+    """
+    Renvoie (type, données) pour le bloc, en ne dépassant jamais la taille du bloc stocké.
+    """
+    stocke = (BLOC_STOCKE, len(bloc).to_bytes(TAILLE_ENTIER, "big") + bloc)
+    frequences = Counter(bloc)
+    if entropie(frequences.values(), len(bloc)) >= SEUIL_ENTROPIE_STOCKE:
+        return stocke
+
+    # Taille exacte du bloc Huffman, calculée sans le coder
+    longueurs = longueurs_huffman(frequences)
+    nb_bits = sum(f * longueurs[octet] for octet, f in frequences.items())
+    taille_huffman = 2 * TAILLE_ENTIER + 1 + 2 * len(longueurs) + (nb_bits + 7) // 8
+
+    candidat = None
+    try:
+        texte = bloc.decode("utf-8")
+    except UnicodeDecodeError:  # Pas du texte : l'AHA sur les caractères est exclu
+        texte = None
+    if texte is not None and estimer_aha(texte) < GAIN_MINIMAL_AHA * taille_huffman:
+        candidat = (BLOC_AHA, coder_aha(texte))
+    elif taille_huffman < len(stocke[1]):
+        candidat = (BLOC_HUFFMAN, coder_huffman(bloc, longueurs))
+
+    if candidat is None or len(candidat[1]) >= len(stocke[1]):
+        return stocke
+    return candidat
+
+
+def compresser_flux_blocs(fin, fout, taille_bloc: int = TAILLE_BLOC_DEFAUT) -> Counter:
+    """
+    Compresse le flux binaire 'fin' en mode blocs dans 'fout' (flux positionnable).
+    Renvoie le nombre de blocs de chaque type.
+    """
+    position_entete = texte_utils.reserver_entete(fout)
+
+    taille_origine = 0
+    types = Counter()
+    for bloc in lire_blocs(fin, taille_bloc):
+        type_bloc, donnees = choisir_et_coder(bloc)
+        fout.write(bytes([type_bloc]))
+        fout.write(donnees)
+        taille_origine += len(bloc)
+        types[NOMS_BLOCS[type_bloc]] += 1
+
+    texte_utils.ecrire_entete_reservee(fout, position_entete, texte_utils.MODE_BLOCS, taille_origine)
+    return types
+
+
+def lire_exactement(fichier_entree, n: int) -> bytes:
+    donnees = fichier_entree.read(n)
+    if len(donnees) != n:
+        raise ValueError("Fichier compressé invalide : bloc tronqué.")
+    return donnees
+
+
+def lire_entier(fichier_entree) -> int:
+    return int.from_bytes(lire_exactement(fichier_entree, TAILLE_ENTIER), "big")
+
+
+def decoder_huffman(fichier_entree) -> bytes:
+    n = lire_entier(fichier_entree)
+    nb_bits = lire_entier(fichier_entree)
+    nb_symboles = lire_exactement(fichier_entree, 1)[0] + 1
+    table = lire_exactement(fichier_entree, 2 * nb_symboles)
+    longueurs = {table[i]: table[i + 1] for i in range(0, len(table), 2)}
+    inverse = {code: symbole for symbole, code in codes_canoniques(longueurs).items()}
+    longueurs_possibles = sorted(set(longueurs.values()))
+
+    bits = octets_vers_bits(lire_exactement(fichier_entree, (nb_bits + 7) // 8), nb_bits)
+    sortie = bytearray()
+    pos = 0
+    while len(sortie) < n:
+        for longueur in longueurs_possibles:
+            symbole = inverse.get(bits[pos:pos + longueur])
+            if symbole is not None:
+                sortie.append(symbole)
+                pos += longueur
+                break
+        else:
+            raise ValueError("Fichier compressé invalide : code de Huffman inconnu.")
+    return bytes(sortie)
+
+
+def decoder_aha(fichier_entree) -> bytes:
+    nb_bits = lire_entier(fichier_entree)
+    lecteur = texte_utils.LecteurBits(io.BytesIO(lire_exactement(fichier_entree, (nb_bits + 7) // 8)), nb_bits)
+    arbre = aha_et_utils.AHA(historique=False)
+    caracteres = []
+    while lecteur.nb_bits_restants > 0:
+        ch = arbre.decoder_caractere(lecteur)
+        if ch is None:
+            break
+        caracteres.append(ch)
+    return "".join(caracteres).encode("utf-8")
+
+
+def decomprimer_flux_blocs(fichier_entree, fichier_sortie, taille_origine: int) -> None:
+    """
+    Décode un flux en mode blocs (l'en-tête de 8 octets a déjà été lu) et écrit
+    les octets d'origine dans le flux binaire 'fichier_sortie'.
+    """
+    ecrits = 0
+    while ecrits < taille_origine:
+        type_bloc = lire_exactement(fichier_entree, 1)[0]
+        if type_bloc == BLOC_STOCKE:
+            bloc = lire_exactement(fichier_entree, lire_entier(fichier_entree))
+        elif type_bloc == BLOC_HUFFMAN:
+            bloc = decoder_huffman(fichier_entree)
+        elif type_bloc == BLOC_AHA:
+            bloc = decoder_aha(fichier_entree)
+        else:
+            raise ValueError(f"Fichier compressé invalide : type de bloc inconnu ({type_bloc}).")
+        fichier_sortie.write(bloc)
+        ecrits += len(bloc)
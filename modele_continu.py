@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import argparse
+import codecs
+import io
+import os
+import queue
+import sys
+import threading
+import time
+
+import aha_et_utils
+import texte_utils
+
+"""
+Mode « continu » : compression de données vivantes (journaux, flux de messages).
+
+Le flux de bits est découpé en segments alignés sur l'octet, chacun précédé de sa longueur :
+le récepteur décode chaque segment dès qu'il l'a reçu, sans attendre la fin du flux.
+Vider (sync-flush) termine le segment en cours ; l'arbre AHA, lui, continue sans
+changement d'un segment à l'autre. La vidange est automatique au-delà d'un volume
+d'entrée, et/ou d'une durée : la latence est alors bornée par l'intervalle choisi.
+
+Format :
+    [8 octets en-tête = mode continu + 0]
+    [4 octets nb_bits][bits du segment, padding de 0]   (répété)
+    [4 octets à 0 = fin du flux]
+"""
+
+TAILLE_LONGUEUR_SEGMENT = 4
+FLUSH_KIO_DEFAUT = 1024  # Vidange au plus tous les 1 Mio d'entrée
+FLUSH_KIO_MAX = 16 * 1024  # Garde le nombre de bits d'un segment sur 4 octets
+TAILLE_LECTURE = 1 << 16
+
+
+class CodeurContinu:
+    """
+    Codeur AHA incrémental : coder(octets) autant de fois que voulu,
+    vider() pour rendre décodable tout ce qui précède, terminer() à la fin.
+    """
+
+    def __init__(self, fout):
+        self.fout = fout
+        self.arbre = aha_et_utils.AHA(historique=False)
+        self.decodeur = codecs.getincrementaldecoder("utf-8")()  # Garde un caractère coupé entre deux appels
+        self.morceaux = []
+        self.octets_en_attente = 0
+        self.nb_segments = 0
+        texte_utils.ecrire_entete(fout, texte_utils.MODE_CONTINU, 0)
+
+    def coder(self, octets: bytes, final: bool = False) -> None:
+        for ch in self.decodeur.decode(octets, final):
+            self.morceaux.append(self.arbre.coder_caractere(ch))  # Caractère nouveau : dièze + UTF-8
+        self.octets_en_attente += len(octets)
+
+    def vider(self) -> None:
+        """
+        Sync-flush : écrit le segment en cours (longueur + bits complétés à l'octet).
+        """
+        bits = "".join(self.morceaux)
+        self.morceaux = []
+        self.octets_en_attente = 0
+        if not bits:
+            return
+        self.fout.write(len(bits).to_bytes(TAILLE_LONGUEUR_SEGMENT, "big"))
+        self.fout.write(texte_utils.bits_vers_octets(bits))
+        self.fout.flush()
+        self.nb_segments += 1
+
+    def terminer(self) -> None:
+        self.coder(b"", final=True)
+        self.vider()
+        self.fout.write(b"\x00" * TAILLE_LONGUEUR_SEGMENT)
+        self.fout.flush()
+
+
+def lire_en_continu(fin, file: queue.Queue) -> None:
+    """
+    Fil lecteur : pousse ce qui est disponible (read1 ne bloque pas jusqu'à remplir le bloc).
+    """
+    lire = getattr(fin, "read1", fin.read)
+    try:
+        while True:
+            bloc = lire(TAILLE_LECTURE)
+            file.put(bloc)
+            if not bloc:
+                return
+    except Exception as e:  # Relevée dans le fil du codeur
+        file.put(e)
+
+
+def compresser_flux_continu(fin, fout, flush_ms: float = None, flush_kio: int = FLUSH_KIO_DEFAUT) -> CodeurContinu:
+    """
+    Compresse 'fin' en mode continu dans 'fout' (pas besoin d'un flux positionnable).
+    Vidange quand flush_kio Kio d'entrée sont en attente et, si flush_ms est donné,
+    quand la plus ancienne donnée en attente a plus de flush_ms millisecondes.
+    """
+    codeur = CodeurContinu(fout)
+    seuil_octets = min(flush_kio, FLUSH_KIO_MAX) * 1024
+
+    if flush_ms is None:
+        while True:
+            bloc = fin.read(TAILLE_LECTURE)
+            if not bloc:
+                break
+            codeur.coder(bloc)
+            if codeur.octets_en_attente >= seuil_octets:
+                codeur.vider()
+        codeur.terminer()
+        return codeur
+
+    # Politique temporelle : un fil lit l'entrée, le codeur attend au plus jusqu'à l'échéance
+    intervalle = flush_ms / 1000
+    file = queue.Queue(maxsize=4)
+    threading.Thread(target=lire_en_continu, args=(fin, file), name="lecteur", daemon=True).start()
+    echeance = None  # Instant où la plus ancienne donnée en attente doit être envoyée
+    while True:
+        attente = None if echeance is None else max(0.0, echeance - time.monotonic())
+        try:
+            bloc = file.get(timeout=attente)
+        except queue.Empty:
+            codeur.vider()
+            echeance = None
+            continue
+        if isinstance(bloc, Exception):
+            raise bloc
+        if not bloc:
+            break
+        if echeance is None:
+            echeance = time.monotonic() + intervalle
+        codeur.coder(bloc)
+        if codeur.octets_en_attente >= seuil_octets or time.monotonic() >= echeance:
+            codeur.vider()
+            echeance = None
+    codeur.terminer()
+    return codeur
+
+
+def decomprimer_flux_continu(fichier_entree, fichier_sortie) -> None:
+    """
+    Décode un flux en mode continu (l'en-tête de 8 octets a déjà été lu),
+    segment par segment, en vidant la sortie après chacun.
+    Un flux interrompu entre deux segments est décodé jusqu'au dernier segment complet.
+    """
+    arbre = aha_et_utils.AHA(historique=False)
+    while True:
+        longueur = fichier_entree.read(TAILLE_LONGUEUR_SEGMENT)
+        if not longueur:  # Flux coupé avant le marqueur de fin
+            return
+        if len(longueur) != TAILLE_LONGUEUR_SEGMENT:
+            raise ValueError("Fichier compressé invalide : longueur de segment tronquée.")
+        nb_bits = int.from_bytes(longueur, "big")
+        if nb_bits == 0:  # Marqueur de fin
+            return
+
+        donnees = fichier_entree.read((nb_bits + 7) // 8)
+        if len(donnees) != (nb_bits + 7) // 8:
+            raise ValueError("Fichier compressé invalide : segment tronqué.")
+        lecteur = texte_utils.LecteurBits(io.BytesIO(donnees), nb_bits)
+        while lecteur.nb_bits_restants > 0:
+            ch = arbre.decoder_caractere(lecteur)
+            if ch is None:
+                break
+            fichier_sortie.write(ch)
+        fichier_sortie.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compression AHA en continu, de l'entrée standard vers la sortie standard."
+    )
+    parser.add_argument("operation", choices=["compresser", "decompresser"])
+    parser.add_argument("--flush-ms", type=float, default=None,
+                        help="Latence maximale : vidange quand la donnée la plus ancienne a cet âge")
+    parser.add_argument("--flush-kio", type=int, default=FLUSH_KIO_DEFAUT,
+                        help=f"Vidange après ce volume d'entrée (au plus {FLUSH_KIO_MAX})")
+    args = parser.parse_args()
+
+    try:
+        if args.operation == "compresser":
+            compresser_flux_continu(sys.stdin.buffer, sys.stdout.buffer, args.flush_ms, args.flush_kio)
+        else:
+            entree = sys.stdin.buffer
+            mode, _ = texte_utils.lire_entete(entree.read(texte_utils.TAILLE_ENTETE_OCTETS))
+            if mode != texte_utils.MODE_CONTINU:
+                raise ValueError("Le flux n'est pas en mode continu : utilisez ./decompresser.")
+            sortie = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="")
+            decomprimer_flux_continu(entree, sortie)
+            sortie.flush()
+    except ValueError as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        sys.exit(1)
+    except BrokenPipeError:
+        # Le lecteur de la sortie est parti ; le fil lecteur peut être bloqué sur stdin,
+        # on quitte donc sans la finalisation de l'interpréteur.
+        os._exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import re
+
+import aha_et_utils
+import texte_utils
+
+"""
+Mode « mots » : les symboles de l'arbre AHA sont des jetons (mots, suites d'espaces,
+signes de ponctuation) au lieu de caractères. Sur de la prose, on fait environ
+2,5 fois moins de mises à jour de l'arbre par octet lu, mais chacune coûte bien plus
+cher : l'arbre est plus profond et presque chaque jeton provoque un échange de sous-arbres.
+Ce n'est donc pas un mode de débit. Mesures sur test_texts (taux, puis temps face au mode
+continu, qui code les caractères avec le même moteur) :
+
+    sorbonne_html    0,225 contre 0,400    2 fois plus lent
+    code_c           0,354 contre 0,555    1,5 fois plus lent
+    benjamine        0,482 contre 0,560    4 à 5 fois plus lent
+    de_pontoise      0,567 contre 0,550    5 à 10 fois plus lent, et moins bon
+    medium_zipf      1,000 contre 0,475    sortie plus grosse que l'entrée
+
+Le gain ne porte que sur le taux, et seulement pour un vocabulaire qui se répète
+(balisage, code, prose longue). Chaque jeton nouveau coûte un littéral complet :
+sur un vocabulaire riche ou aléatoire, mieux vaut le mode continu ou ordre1.
+
+Un jeton nouveau est transmis par le dièze suivi d'un littéral :
+    [longueur en octets, entier variable (7 bits par octet, bit de poids fort = suite)]
+    [octets UTF-8 du jeton]
+"""
+
+JETON = re.compile(r"\w+|\s+|[^\w\s]")
+
+
+def lire_jetons(fin):
+    """
+    Générateur des jetons d'un flux binaire UTF-8, lu par blocs.
+    """
+    reste = ""
+    for bloc in texte_utils.lire_blocs_texte(fin):
+        jetons = JETON.findall(reste + bloc)
+        if not jetons:
+            continue
+        reste = jetons.pop()  # Le dernier jeton peut continuer dans le bloc suivant
+        yield from jetons
+    if reste:
+        yield reste
+
+
+def entier_vers_bits(n: int) -> str:
+    """
+    Écrit n en entier variable : groupes de 7 bits, poids forts d'abord, bit de tête à 1 si un groupe suit.
+    """
+    groupes = [n & 0x7F]
+    n >>= 7
+    while n:
+        groupes.append(n & 0x7F)
+        n >>= 7
+    groupes.reverse()
+    return "".join(f"{(0x80 if i < len(groupes) - 1 else 0) | g:08b}" for i, g in enumerate(groupes))
+
+
+def lire_entier(lecteur: texte_utils.LecteurBits) -> int:
+    n = 0
+    while True:
+        octet = int(lecteur.lire_n_bits(8), 2)
+        n = (n << 7) | (octet & 0x7F)
+        if not octet & 0x80:
+            return n
+
+
+def litteral_vers_bits(jeton: str) -> str:
+    octets = jeton.encode("utf-8")
+    return entier_vers_bits(len(octets)) + "".join(f"{o:08b}" for o in octets)
+
+
+def lire_litteral(lecteur: texte_utils.LecteurBits) -> str:
+    longueur = lire_entier(lecteur)
+    bits = lecteur.lire_n_bits(8 * longueur)
+    return bytes(int(bits[i:i + 8], 2) for i in range(0, len(bits), 8)).decode("utf-8")
+
+
+def compresser_flux_mots(fin, fout) -> None:
+    """
+    Compresse le flux binaire 'fin' en mode mots dans 'fout' (flux positionnable) :
+
+        [8 octets en-tête = mode mots + nb_bits]
+        [flux de bits compressés, padding de 0]
+    """
+    position_entete = texte_utils.reserver_entete(fout)
+
+    etat = {"current_byte": 0, "bit_pos": 0, "nb_bits": 0}
+    arbre = aha_et_utils.AHA(historique=False)
+
+    for jeton in lire_jetons(fin):
+        bits = arbre.coder_caractere(jeton, litteral_vers_bits)  # Jeton nouveau : dièze + littéral
+        if bits:
+            texte_utils.ecrire_bits(fout, bits, etat)
+
+    texte_utils.terminer_flux_bits(fout, etat, position_entete, texte_utils.MODE_MOTS)
+
+
+def decomprimer_flux_mots(fichier_entree, fichier_sortie, nb_bits_utiles: int) -> None:
+    """
+    Décode un flux en mode mots (l'en-tête de 8 octets a déjà été lu).
+    """
+    lecteur = texte_utils.LecteurBits(fichier_entree, nb_bits_utiles)
+    arbre = aha_et_utils.AHA(historique=False)
+
+    while lecteur.nb_bits_restants > 0:
+        jeton = arbre.decoder_caractere(lecteur, lire_litteral)
+        if jeton is None:
+            break
+        fichier_sortie.write(jeton)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from collections import OrderedDict
+
+import aha_et_utils
+import texte_utils
+
+"""
+Modélisation d'ordre 1 : un arbre AHA par caractère précédent (contexte).
+
+Pour chaque caractère :
+    - si le contexte a déjà un arbre et y connaît le caractère, on émet son code dans cet arbre ;
+    - sinon on émet le dièze du contexte (s'il existe) puis le codage d'ordre 0
+      (code dans l'arbre d'ordre 0, ou dièze + UTF-8 si le caractère est nouveau).
+L'arbre d'ordre 0 n'est actualisé que lorsqu'il sert à coder (exclusion des mises à jour).
+
+Les arbres de contexte vivent dans un pool borné en nombre de nœuds ; les contextes
+les moins récemment utilisés sont évincés. Le codeur et le décodeur font exactement
+les mêmes accès au pool, l'éviction est donc identique des deux côtés.
+"""
+
+TAILLE_NOEUD_ESTIMEE = 170  # Octets par nœud (Noeud + entrée de nodes), mesuré avec tracemalloc
+BUDGET_KIO_DEFAUT = 4096
+TAILLE_PARAMETRES_OCTETS = 4  # Budget en nœuds, écrit après l'en-tête
+
+
+def budget_en_noeuds(budget_kio: int) -> int:
+    return max(1, budget_kio * 1024 // TAILLE_NOEUD_ESTIMEE)
+
+
+class PoolContextes:
+    """
+    Arbres AHA indexés par contexte, avec éviction LRU sous un budget de nœuds.
+    """
+
+    def __init__(self, budget_noeuds: int):
+        self.budget_noeuds = budget_noeuds
+        self.arbres = OrderedDict()  # contexte -> AHA, du moins au plus récemment utilisé
+        self.total_noeuds = 0
+        self.nb_evictions = 0
+        self.max_noeuds = 0
+
+    def obtenir(self, contexte):
+        """
+        Renvoie l'arbre du contexte (et le marque comme récent), ou None.
+        """
+        arbre = self.arbres.get(contexte)
+        if arbre is not None:
+            self.arbres.move_to_end(contexte)
+        return arbre
+
+    def actualiser(self, contexte, symbole) -> None:
+        """
+        Ajoute le symbole dans l'arbre du contexte (créé si besoin) puis applique le budget.
+        """
+        arbre = self.arbres.get(contexte)
+        if arbre is None:
+            arbre = aha_et_utils.AHA(historique=False)
+            self.arbres[contexte] = arbre
+            self.total_noeuds += arbre.nb_noeuds()
+        self.arbres.move_to_end(contexte)
+
+        avant = arbre.nb_noeuds()
+        arbre.modification(symbole)
+        self.total_noeuds += arbre.nb_noeuds() - avant
+        self.max_noeuds = max(self.max_noeuds, self.total_noeuds)
+
+        # On évince les contextes froids, jamais celui qu'on vient d'utiliser
+        while self.total_noeuds > self.budget_noeuds and len(self.arbres) > 1:
+            _, arbre_evince = self.arbres.popitem(last=False)
+            self.total_noeuds -= arbre_evince.nb_noeuds()
+            self.nb_evictions += 1
+
+
+def compresser_flux_ordre1(fin, fout, budget_kio: int = BUDGET_KIO_DEFAUT) -> PoolContextes:
+    """
+    Compresse le flux binaire 'fin' en mode ordre 1 dans 'fout' (flux positionnable) :
+
+        [8 octets en-tête = mode ordre 1 + nb_bits]
+        [4 octets = budget du pool en nœuds]
+        [flux de bits compressés, padding de 0]
+    """
+    budget_noeuds = budget_en_noeuds(budget_kio)
+    position_entete = texte_utils.reserver_entete(fout)
+    fout.write(budget_noeuds.to_bytes(TAILLE_PARAMETRES_OCTETS, byteorder="big"))
+
+    etat = {"current_byte": 0, "bit_pos": 0, "nb_bits": 0}
+    arbre0 = aha_et_utils.AHA(historique=False)
+    pool = PoolContextes(budget_noeuds)
+    precedent = None
+
+    for ch in texte_utils.lire_caracteres(fin):
+        bits = ""
+        arbre_contexte = pool.obtenir(precedent)
+        code = arbre_contexte.code_symbole(ch) if arbre_contexte is not None else None
+
+        if code is not None:  # Le contexte connaît le caractère
+            bits += code
+        else:
+            if arbre_contexte is not None:
+                bits += arbre_contexte.code_dieze()  # Échappement vers l'ordre 0
+            bits += arbre0.coder_caractere(ch)
+
+        pool.actualiser(precedent, ch)
+        precedent = ch
+
+        if bits:
+            texte_utils.ecrire_bits(fout, bits, etat)
+
+    texte_utils.terminer_flux_bits(fout, etat, position_entete, texte_utils.MODE_ORDRE1)
+    return pool
+
+
+def decomprimer_flux_ordre1(fichier_entree, fichier_sortie, nb_bits_utiles: int) -> None:
+    """
+    Décode un flux en mode ordre 1 (l'en-tête de 8 octets a déjà été lu).
+    """
+    parametres = fichier_entree.read(TAILLE_PARAMETRES_OCTETS)
+    if len(parametres) != TAILLE_PARAMETRES_OCTETS:
+        raise ValueError("Fichier compressé invalide : paramètres du mode ordre 1 manquants.")
+    budget_noeuds = int.from_bytes(parametres, "big")
+
+    lecteur = texte_utils.LecteurBits(fichier_entree, nb_bits_utiles)
+    arbre0 = aha_et_utils.AHA(historique=False)
+    pool = PoolContextes(budget_noeuds)
+    precedent = None
+
+    while lecteur.nb_bits_restants > 0:
+        arbre_contexte = pool.obtenir(precedent)
+        ch = arbre_contexte.decoder_symbole(lecteur) if arbre_contexte is not None else aha_et_utils.DIEZE
+        if ch is None:
+            break
+
+        if ch is aha_et_utils.DIEZE:  # Échappement (ou contexte inconnu) : on décode avec l'ordre 0
+            ch = arbre0.decoder_caractere(lecteur)
+            if ch is None:
+                break
+
+        fichier_sortie.write(ch)
+        pool.actualiser(precedent, ch)
+        precedent = ch
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import queue
+import threading
+from contextlib import contextmanager
+
+"""
+Étages lecteur / codeur / écrivain reliés par des files bornées.
+
+Le codeur (fil principal) travaille sur des flux enveloppés :
+    - LecteurAnticipe lit l'entrée par gros blocs dans un fil secondaire, en avance ;
+    - EcrivainDiffere accumule la sortie et l'écrit dans un autre fil.
+Les appels système de lecture/écriture relâchent le GIL : sur un disque lent ou
+réseau, les E/S se font pendant que l'arbre AHA est mis à jour. Les files bornées
+limitent la mémoire (profondeur × taille de bloc par étage).
+"""
+
+TAILLE_BLOC_PIPELINE = 1 << 20  # 1 Mio par lecture / écriture
+PROFONDEUR_FILE = 4  # Blocs en attente au plus entre deux étages
+
+
+class LecteurAnticipe:
+    """
+    Flux binaire en lecture (read) alimenté par un fil qui lit 'fichier' en avance.
+    """
+
+    def __init__(self, fichier, taille_bloc: int = TAILLE_BLOC_PIPELINE, profondeur: int = PROFONDEUR_FILE):
+        self.fichier = fichier
+        self.taille_bloc = taille_bloc
+        self.file = queue.Queue(maxsize=profondeur)
+        self.arret = threading.Event()
+        self.bloc = b""
+        self.pos = 0
+        self.fini = False
+        self.fil = threading.Thread(target=self.lire_en_avance, name="lecteur", daemon=True)
+        self.fil.start()
+
+    def lire_en_avance(self) -> None:
+        try:
+            while not self.arret.is_set():
+                bloc = self.fichier.read(self.taille_bloc)
+                self.file.put(bloc)
+                if not bloc:  # Fin du fichier signalée par un bloc vide
+                    return
+        except Exception as e:  # Relevée dans le fil du codeur, au prochain read
+            self.file.put(e)
+
+    def read(self, n: int = -1) -> bytes:
+        if 0 < n <= len(self.bloc) - self.pos:  # Cas courant : tout est dans le bloc en cours
+            debut = self.pos
+            self.pos += n
+            return self.bloc[debut:self.pos]
+
+        morceaux = []
+        while n != 0:
+            if self.pos >= len(self.bloc):
+                if self.fini:
+                    break
+                element = self.file.get()
+                if isinstance(element, Exception):
+                    raise element
+                if not element:
+                    self.fini = True
+                    break
+                self.bloc = element
+                self.pos = 0
+            pris = len(self.bloc) - self.pos if n < 0 else min(n, len(self.bloc) - self.pos)
+            morceaux.append(self.bloc[self.pos:self.pos + pris])
+            self.pos += pris
+            if n > 0:
+                n -= pris
+        return b"".join(morceaux)
+
+    def fermer(self) -> None:
+        # On vide la file pour débloquer le fil s'il attend une place
+        self.arret.set()
+        while self.fil.is_alive():
+            try:
+                self.file.get(timeout=0.01)
+            except queue.Empty:
+                pass
+        self.fil.join()
+
+
+class EcrivainDiffere:
+    """
+    Flux en écriture (binaire ou texte) dont les écritures sont regroupées
+    puis faites par un fil secondaire. seek / tell restent possibles
+    (seek attend que tout ce qui précède soit écrit).
+    """
+
+    def __init__(self, fichier, taille_tampon: int = TAILLE_BLOC_PIPELINE, profondeur: int = PROFONDEUR_FILE):
+        self.fichier = fichier
+        self.taille_tampon = taille_tampon
+        self.file = queue.Queue(maxsize=profondeur)
+        self.morceaux = []
+        self.taille = 0
+        self.position = fichier.tell() if fichier.seekable() else 0
+        self.erreur = None
+        self.fil = threading.Thread(target=self.ecrire_en_arriere_plan, name="ecrivain", daemon=True)
+        self.fil.start()
+
+    def ecrire_en_arriere_plan(self) -> None:
+        while True:
+            element = self.file.get()
+            try:
+                if element is None:
+                    return
+                if self.erreur is None:
+                    self.fichier.write(element)
+            except Exception as e:  # Relevée dans le fil du codeur, au prochain envoi
+                self.erreur = e
+            finally:
+                self.file.task_done()
+
+    def verifier(self) -> None:
+        if self.erreur is not None:
+            raise self.erreur
+
+    def envoyer(self) -> None:
+        self.verifier()
+        if self.morceaux:
+            self.file.put(self.morceaux[0][:0].join(self.morceaux))
+            self.morceaux = []
+            self.taille = 0
+
+    def write(self, donnees):
+        self.morceaux.append(donnees)
+        self.taille += len(donnees)
+        self.position += len(donnees)
+        if self.taille >= self.taille_tampon:
+            self.envoyer()
+        return len(donnees)
+
+    def flush(self) -> None:
+        self.envoyer()
+        self.file.join()
+        self.verifier()
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, position: int, whence: int = 0) -> int:
+        self.flush()
+        self.position = self.fichier.seek(position, whence)
+        return self.position
+
+    def fermer(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.file.put(None)
+            self.fil.join()
+
+
+@contextmanager
+def etages(fin, fout, actif: bool = True):
+    """
+    Enveloppe (fin, fout) dans les étages lecteur et écrivain si 'actif',
+    et attend à la sortie que toute la sortie soit écrite.
+    """
+    if not actif:
+        yield fin, fout
+        return
+    lecteur = LecteurAnticipe(fin)
+    ecrivain = EcrivainDiffere(fout)
+    try:
+        yield lecteur, ecrivain
+    finally:
+        lecteur.fermer()
+        ecrivain.fermer()
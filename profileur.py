@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+"""
+Profileur par échantillonnage, sans dépendance, pour l'option --profile
+de compresser / decompresser (et mesure mémoire de --memoire).
+
+Un fil secondaire relève à intervalle régulier la pile du fil profilé
+(sys._current_frames), ce qui coûte bien moins qu'un profileur déterministe
+comme cProfile. Les piles sont écrites au format « replié » (collapsed stacks) :
+
+    compressor.py:main;compressor.py:compresser_fichier;texte_utils.py:ecrire_bits 42
+
+lisible par flamegraph.pl, speedscope (https://www.speedscope.app) ou inferno.
+"""
+
+INTERVALLE_DEFAUT_S = 0.005
+EXTENSION_PROFIL = ".profil.folded"
+
+
+def nom_cadre(cadre) -> str:
+    code = cadre.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class ProfileurEchantillons:
+    """
+    À utiliser comme gestionnaire de contexte autour du travail à profiler :
+
+        with ProfileurEchantillons() as profil:
+            compresser_fichier(...)
+        profil.ecrire_piles_repliees("sortie.huff.profil.folded")
+        print(profil.resume())
+    """
+
+    def __init__(self, intervalle: float = INTERVALLE_DEFAUT_S):
+        self.intervalle = intervalle
+        self.piles = Counter()  # "a;b;c" -> nombre d'échantillons
+        self.nb_echantillons = 0
+        self.duree = 0.0
+        self.id_fil = None
+        self.arret = threading.Event()
+        self.fil = None
+        self.debut = 0.0
+
+    def echantillonner(self) -> None:
+        while not self.arret.wait(self.intervalle):
+            cadre = sys._current_frames().get(self.id_fil)
+            if cadre is None:
+                continue
+            pile = []
+            while cadre is not None:
+                pile.append(nom_cadre(cadre))
+                cadre = cadre.f_back
+            pile.reverse()  # De la racine vers la feuille
+            self.piles[";".join(pile)] += 1
+            self.nb_echantillons += 1
+
+    def demarrer(self) -> None:
+        self.id_fil = threading.get_ident()
+        self.arret.clear()
+        self.debut = time.perf_counter()
+        self.fil = threading.Thread(target=self.echantillonner, name="profileur", daemon=True)
+        self.fil.start()
+
+    def arreter(self) -> None:
+        self.arret.set()
+        self.fil.join()
+        self.duree = time.perf_counter() - self.debut
+
+    def __enter__(self):
+        self.demarrer()
+        return self
+
+    def __exit__(self, *exc):
+        self.arreter()
+
+    def ecrire_piles_repliees(self, chemin: str) -> None:
+        with open(chemin, "w", encoding="utf-8") as f:
+            for pile, n in sorted(self.piles.items()):
+                f.write(f"{pile} {n}\n")
+
+    def points_chauds(self, n: int = 10):
+        """
+        Renvoie les n fonctions les plus coûteuses : [(fonction, propre, cumulé)],
+        en nombre d'échantillons. « propre » compte les échantillons où la fonction
+        est en haut de pile, « cumulé » ceux où elle est quelque part dans la pile.
+        """
+        propre = Counter()
+        cumule = Counter()
+        for pile, nb in self.piles.items():
+            cadres = pile.split(";")
+            propre[cadres[-1]] += nb
+            for fonction in set(cadres):
+                cumule[fonction] += nb
+        return [(fonction, nb, cumule[fonction]) for fonction, nb in propre.most_common(n)]
+
+    def resume(self, n: int = 10) -> str:
+        total = max(self.nb_echantillons, 1)
+        lignes = [
+            f"Profil : {self.nb_echantillons} échantillons en {self.duree:.2f} s "
+            f"(intervalle {self.intervalle * 1000:.0f} ms)",
+            f"{'propre':>8} {'cumulé':>8}  fonction",
+        ]
+        for fonction, nb_propre, nb_cumule in self.points_chauds(n):
+            lignes.append(f"{100 * nb_propre / total:7.1f}% {100 * nb_cumule / total:7.1f}%  {fonction}")
+        return "\n".join(lignes)
+
+
+def executer_avec_profil(fonction, chemin_sortie: str, *args, n: int = 10):
+    """
+    Exécute fonction(*args) sous le profileur, écrit les piles repliées à côté
+    de chemin_sortie (chemin_sortie + EXTENSION_PROFIL) et affiche le résumé.
+    """
+    with ProfileurEchantillons() as profil:
+        resultat = fonction(*args)
+    chemin_profil = chemin_sortie + EXTENSION_PROFIL
+    profil.ecrire_piles_repliees(chemin_profil)
+    print(profil.resume(n))
+    print(f"Piles repliées écrites dans '{chemin_profil}'")
+    return resultat
+
+
+def rss_max_kio() -> int:
+    """
+    RSS maximal du processus, en Kio (ru_maxrss est en Kio sous Linux, en octets sous macOS).
+    """
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def executer_avec_memoire(fonction, *args):
+    """
+    Exécute fonction(*args) sous tracemalloc puis affiche le pic de mémoire Python
+    et le RSS maximal du processus (tracemalloc ralentit l'exécution de 2 à 3 fois).
+    """
+    tracemalloc.start()
+    try:
+        resultat = fonction(*args)
+        _, pic = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    print(f"Mémoire : pic Python {pic / 1024:.1f} Kio (tracemalloc), RSS max {rss_max_kio() / 1024:.1f} Mio")
+    return resultat
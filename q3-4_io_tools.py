@@ -1,5 +1,49 @@
 import os
-import texte_utils
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : repli sur int.from_bytes / format
+    np = None
+
+
+TAILLE_BLOC_OCTETS = 1 << 20  # Conversion par blocs de 1 Mio pour les gros fichiers
+CHIFFRES_BINAIRES = b"01"
+
+
+def octets_vers_bits(octets: bytes) -> str:
+    """
+    Convertit des octets en chaîne '0'/'1' (MSB → LSB), d'un seul coup.
+    """
+    if not octets:
+        return ""
+    if np is not None:
+        bits = np.unpackbits(np.frombuffer(octets, dtype=np.uint8))
+        return (bits + ord("0")).tobytes().decode("ascii")
+    return format(int.from_bytes(octets, "big"), f"0{8 * len(octets)}b")
+
+
+def bits_vers_octets(bits: bytes) -> bytes:
+    """
+    Convertit une suite ASCII de '0'/'1' (déjà validée) en octets,
+    avec padding de 0 à la fin si sa longueur n'est pas multiple de 8.
+    """
+    if not bits:
+        return b""
+    if np is not None:
+        return np.packbits(np.frombuffer(bits, dtype=np.uint8) - ord("0")).tobytes()
+    nb_octets = (len(bits) + 7) // 8
+    return (int(bits, 2) << (8 * nb_octets - len(bits))).to_bytes(nb_octets, "big")
+
+
+def blocs_bits(f):
+    """
+    Générateur des blocs de la chaîne de bits d'un fichier binaire ouvert.
+    """
+    while True:
+        bloc = f.read(TAILLE_BLOC_OCTETS)
+        if not bloc:
+            break
+        yield octets_vers_bits(bloc)
 
 
 def lecture(fichier_bin: str) -> str:
@@ -7,44 +51,84 @@ def lecture(fichier_bin: str) -> str:
     Q3 — Lecture d’un fichier binaire en chaîne de bits.
     """
     with open(fichier_bin, "rb") as f:
-        nb_bits_utiles = os.path.getsize(fichier_bin) * 8 # Fois huit pour passer de bytes en bits
-        lecteur = texte_utils.LecteurBits(f, nb_bits_utiles)
-        bits = []
-        while True:
-            b = lecteur.lire_bit()
-            if b is None:
-                break
-            bits.append('1' if b == 1 else '0')
-    chaine = "".join(bits)
+        chaine = "".join(blocs_bits(f))
     print(chaine)
     return chaine
 
 
-def ecriture(fichier_chaine_txt: str, fichier_bin: str) -> None:
+def lecture_vers_fichier(fichier_bin: str, fichier_chaine_txt: str) -> None:
     """
-    Q4 — Ecriture d’une chaîne de bits (“0”/“1”) vers un fichier binaire.
+    Q3, pour les gros fichiers : écrit la chaîne de bits dans un fichier texte,
+    bloc par bloc, sans la construire en mémoire.
+    """
+    with open(fichier_bin, "rb") as fin, open(fichier_chaine_txt, "w", encoding="utf-8") as fout:
+        for bits in blocs_bits(fin):
+            fout.write(bits)
+
+
+def blocs_chaine(f):
     """
-    # Lit la chaîne de bits et retire les espaces éventuels
-    with open(fichier_chaine_txt, "r", encoding="utf-8") as f:
-        line = f.read().strip()
+    Générateur des blocs d'un fichier texte de bits, en retirant les espaces
+    de début et de fin du fichier (comme str.strip() sur le contenu entier).
+    """
+    debut = True
+    espaces = ""  # Espaces en fin de bloc : retirés seulement s'ils terminent le fichier
+    while True:
+        bloc = f.read(TAILLE_BLOC_OCTETS)
+        if not bloc:
+            break
+        if debut:
+            bloc = bloc.lstrip()
+            if not bloc:
+                continue
+            debut = False
+        coeur = bloc.rstrip()
+        if coeur:
+            yield espaces + coeur
+            espaces = bloc[len(coeur):]
+        else:
+            espaces += bloc
+
 
-    # Uniquement '0' ou '1'
-    for ch in line:
-        if ch not in ("0", "1"):
+def ecrire_bits(fin, fout) -> None:
+    """
+    Valide et convertit bloc par bloc le fichier texte de bits 'fin' vers le binaire 'fout'.
+    """
+    reste = b""  # Bits d'un octet incomplet, reportés au bloc suivant
+    for bloc in blocs_chaine(fin):
+        # Uniquement '0' ou '1'
+        try:
+            bits = bloc.encode("ascii")
+        except UnicodeEncodeError:
+            bits = None
+        if bits is None or bits.translate(None, CHIFFRES_BINAIRES):
             raise ValueError(
                 "Le fichier texte pour Q4 doit contenir uniquement des caractères '0' et '1'."
             )
 
-    # Écrit la suite de bits dans le binaire (MSB → LSB, octets complets, padding 0 à fin si besoin)
-    with open(fichier_bin, "wb") as fout:
-        etat = {
-            "current_byte": 0,
-            "bit_pos": 0,
-            "nb_bits": 0,
-        }
-        texte_utils.ecrire_bits(fout, line, etat)
-
-        # Padding
-        if etat["bit_pos"] > 0:
-            etat["current_byte"] <<= (8 - etat["bit_pos"])
-            fout.write(bytes([etat["current_byte"]]))
+        bits = reste + bits
+        coupure = len(bits) - len(bits) % 8
+        fout.write(bits_vers_octets(bits[:coupure]))
+        reste = bits[coupure:]
+
+    # Padding
+    fout.write(bits_vers_octets(reste))
+
+
+def ecriture(fichier_chaine_txt: str, fichier_bin: str) -> None:
+    """
+    Q4 — Ecriture d’une chaîne de bits (“0”/“1”) vers un fichier binaire.
+    """
+    # Écrit la suite de bits dans le binaire (MSB → LSB, octets complets, padding 0 à fin si besoin).
+    # On écrit dans un fichier temporaire, qui ne remplace le binaire qu'une fois toute l'entrée validée :
+    # sur une entrée invalide, un binaire existant reste intact et aucun fichier partiel n'est laissé.
+    temporaire = f"{fichier_bin}.{os.getpid()}.tmp"
+    try:
+        with open(fichier_chaine_txt, "r", encoding="utf-8") as fin, open(temporaire, "wb") as fout:
+            ecrire_bits(fin, fout)
+        os.replace(temporaire, fichier_bin)
+    except BaseException:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import argparse
+import asyncio
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import compressor
+import decompressor
+
+"""
+Serveur de compression asyncio (socket Unix ou TCP local).
+
+Évite de relancer ./compresser à chaque fichier (démarrage de Python, imports...).
+Le travail AHA, lourd en CPU, est confié à un pool de processus.
+
+Protocole (une connexion peut enchaîner plusieurs requêtes) :
+    requête : [1 octet opération][8 octets longueur, big-endian][données]
+    réponse : [1 octet statut][8 octets longueur, big-endian][données]
+
+    opérations : b"C" compression, b"D" décompression, b"S" statistiques (JSON)
+    statuts    : b"O" succès, b"E" erreur (message UTF-8 dans les données)
+
+Une requête annonçant plus de --taille-max-mio Mio reçoit une erreur et la connexion
+est fermée, sans rien lire des données : un en-tête forgé ne peut pas faire grossir
+la mémoire du serveur sans limite.
+"""
+
+OP_COMPRESSION = b"C"
+OP_DECOMPRESSION = b"D"
+OP_STATISTIQUES = b"S"
+STATUT_OK = b"O"
+STATUT_ERREUR = b"E"
+TAILLE_ENTETE_MESSAGE = 9  # 1 octet opération/statut + 8 octets longueur
+TAILLE_BLOC_LECTURE = 1 << 16  # Les données sont lues par blocs de 64 Kio
+TAILLE_MAX_MIO_DEFAUT = 256  # Taille maximale des données d'une requête
+
+ADRESSE_HOTE_DEFAUT = "127.0.0.1"
+PORT_DEFAUT = 8765
+
+
+def tache_compression(donnees: bytes) -> bytes:
+    """
+    Compresse 'donnees' en mémoire (exécuté dans un processus du pool).
+    """
+    fin = io.BytesIO(donnees)
+    fout = io.BytesIO()
+    compressor.compresser_flux(fin, fout)
+    return fout.getvalue()
+
+
+def tache_decompression(donnees: bytes) -> bytes:
+    """
+    Décompresse 'donnees' en mémoire et renvoie les octets d'origine.
+    """
+    return decompressor.decomprimer_octets(donnees)
+
+
+TACHES = {
+    OP_COMPRESSION: tache_compression,
+    OP_DECOMPRESSION: tache_decompression,
+}
+
+
+def entete_message(code: bytes, longueur: int) -> bytes:
+    """
+    Construit l'en-tête de 9 octets d'un message du protocole.
+    """
+    return code + longueur.to_bytes(8, byteorder="big")
+
+
+class ServeurCompression:
+    """
+    Reçoit les requêtes, les place dans le pool de processus
+    et tient à jour les compteurs (file d'attente, latences).
+    """
+
+    def __init__(self, nb_processus: int = None, taille_max_mio: int = TAILLE_MAX_MIO_DEFAUT):
+        self.nb_processus = nb_processus or os.cpu_count() or 1
+        self.taille_max = taille_max_mio * 1024 * 1024
+        self.pool = ProcessPoolExecutor(max_workers=self.nb_processus)
+        # Contre-pression : au plus un travail par processus. Les autres connexions
+        # attendent sans lire leurs données, le client est donc freiné par la socket.
+        self.places = asyncio.Semaphore(self.nb_processus)
+        self.stats = {
+            "processus": self.nb_processus,
+            "en_attente": 0,  # Profondeur de la file (requêtes qui attendent un processus)
+            "en_cours": 0,
+            "terminees": 0,
+            "erreurs": 0,
+            "refusees": 0,  # Requêtes au-delà de la taille maximale
+            "octets_recus": 0,
+            "octets_envoyes": 0,
+            "latence_totale_ms": 0.0,
+            "latence_max_ms": 0.0,
+            "attente_totale_ms": 0.0,
+        }
+
+    def statistiques(self) -> dict:
+        """
+        Renvoie une copie des compteurs avec la latence moyenne.
+        """
+        stats = dict(self.stats)
+        if stats["terminees"] > 0:
+            stats["latence_moyenne_ms"] = stats["latence_totale_ms"] / stats["terminees"]
+            stats["attente_moyenne_ms"] = stats["attente_totale_ms"] / stats["terminees"]
+        else:
+            stats["latence_moyenne_ms"] = 0.0
+            stats["attente_moyenne_ms"] = 0.0
+        return stats
+
+    async def lire_donnees(self, reader: asyncio.StreamReader, longueur: int) -> bytes:
+        """
+        Lit 'longueur' octets de la connexion, bloc par bloc.
+        """
+        donnees = bytearray()
+        while len(donnees) < longueur:
+            bloc = await reader.readexactly(min(TAILLE_BLOC_LECTURE, longueur - len(donnees)))
+            donnees += bloc
+        self.stats["octets_recus"] += longueur
+        return bytes(donnees)
+
+    async def executer(self, operation: bytes, reader: asyncio.StreamReader, longueur: int) -> bytes:
+        """
+        Attend une place dans le pool, lit les données et exécute la tâche.
+        """
+        debut = time.perf_counter()
+        self.stats["en_attente"] += 1
+        try:
+            await self.places.acquire()
+        finally:
+            self.stats["en_attente"] -= 1
+        debut_travail = time.perf_counter()
+        self.stats["en_cours"] += 1
+        try:
+            donnees = await self.lire_donnees(reader, longueur)
+            boucle = asyncio.get_running_loop()
+            resultat = await boucle.run_in_executor(self.pool, TACHES[operation], donnees)
+        finally:
+            self.stats["en_cours"] -= 1
+            self.places.release()
+
+        fin = time.perf_counter()
+        latence = (fin - debut) * 1000
+        self.stats["terminees"] += 1
+        self.stats["latence_totale_ms"] += latence
+        self.stats["latence_max_ms"] = max(self.stats["latence_max_ms"], latence)
+        self.stats["attente_totale_ms"] += (debut_travail - debut) * 1000
+        return resultat
+
+    async def repondre(self, writer: asyncio.StreamWriter, statut: bytes, donnees: bytes) -> None:
+        writer.write(entete_message(statut, len(donnees)))
+        writer.write(donnees)
+        await writer.drain()  # Contre-pression côté écriture
+        self.stats["octets_envoyes"] += len(donnees)
+
+    async def gerer_connexion(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Traite les requêtes d'une connexion jusqu'à sa fermeture.
+        """
+        try:
+            while True:
+                try:
+                    entete = await reader.readexactly(TAILLE_ENTETE_MESSAGE)
+                except asyncio.IncompleteReadError:
+                    break  # Le client a fermé la connexion
+
+                operation = entete[:1]
+                longueur = int.from_bytes(entete[1:], "big")
+
+                if longueur > self.taille_max:
+                    self.stats["refusees"] += 1
+                    message = f"Requête trop grande : {longueur} octets (au plus {self.taille_max})"
+                    await self.repondre(writer, STATUT_ERREUR, message.encode("utf-8"))
+                    break  # Les données ne seront pas lues : le flux n'est plus synchronisé, on coupe
+
+                if operation == OP_STATISTIQUES:
+                    await self.lire_donnees(reader, longueur)  # Données ignorées
+                    reponse = json.dumps(self.statistiques()).encode("utf-8")
+                    await self.repondre(writer, STATUT_OK, reponse)
+                    continue
+
+                if operation not in TACHES:
+                    await self.repondre(writer, STATUT_ERREUR, f"Opération inconnue : {operation!r}".encode("utf-8"))
+                    break  # Le flux n'est plus synchronisé, on coupe
+
+                try:
+                    resultat = await self.executer(operation, reader, longueur)
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:  # Erreur dans la tâche : on la renvoie au client
+                    self.stats["erreurs"] += 1
+                    await self.repondre(writer, STATUT_ERREUR, str(e).encode("utf-8"))
+                    continue
+
+                await self.repondre(writer, STATUT_OK, resultat)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def servir(self, chemin_socket: str = None, hote: str = ADRESSE_HOTE_DEFAUT, port: int = PORT_DEFAUT) -> None:
+        """
+        Lance le serveur sur une socket Unix si 'chemin_socket' est donné, sinon en TCP.
+        """
+        if chemin_socket:
+            if os.path.exists(chemin_socket):
+                os.remove(chemin_socket)
+            serveur = await asyncio.start_unix_server(self.gerer_connexion, path=chemin_socket)
+            print(f"Serveur de compression sur la socket '{chemin_socket}' ({self.nb_processus} processus)")
+        else:
+            serveur = await asyncio.start_server(self.gerer_connexion, hote, port)
+            print(f"Serveur de compression sur {hote}:{port} ({self.nb_processus} processus)")
+
+        try:
+            async with serveur:
+                await serveur.serve_forever()
+        finally:
+            self.pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur de compression AHA (asyncio + pool de processus).")
+    parser.add_argument("--unix", type=str, default="", help="Chemin de la socket Unix (sinon TCP local)")
+    parser.add_argument("--hote", type=str, default=ADRESSE_HOTE_DEFAUT, help="Adresse d'écoute TCP")
+    parser.add_argument("--port", type=int, default=PORT_DEFAUT, help="Port d'écoute TCP")
+    parser.add_argument("--processus", type=int, default=0,
+                        help="Taille du pool de processus (par défaut : nombre de cœurs)")
+    parser.add_argument("--taille-max-mio", type=int, default=TAILLE_MAX_MIO_DEFAUT,
+                        help="Taille maximale des données d'une requête, en Mio")
+    args = parser.parse_args()
+
+    async def lancer():
+        serveur = ServeurCompression(args.processus or None, args.taille_max_mio)
+        await serveur.servir(args.unix or None, args.hote, args.port)
+
+    try:
+        asyncio.run(lancer())
+    except KeyboardInterrupt:
+        print("Arrêt du serveur.")
+
+
+if __name__ == "__main__":
+    main()
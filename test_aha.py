@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import glob
+import io
+import os
+
+import pytest
+
+import aha_et_utils
+import modele_mots
+import texte_utils
+
+"""
+Tests de non-régression du moteur AHA : après chaque modification(), le chaînage
+prec / suiv doit redonner exactement parcours_gdbh(), et (moteur corrigé) les poids
+doivent croître le long de gdbh (propriété de frère).
+
+    python3 -m pytest -q test_aha.py
+"""
+
+DOSSIER_TEXTES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_texts")
+LIMITE_CARACTERES = 20000  # parcours_gdbh() à chaque pas est en O(nœuds) : on se limite au début des textes
+LIMITE_JETONS = 3000
+TEXTES = sorted(glob.glob(os.path.join(DOSSIER_TEXTES, "*.txt")))
+
+
+def chainage(arbre) -> list:
+    noeuds = []
+    noeud = arbre.tete
+    while noeud is not None:
+        noeuds.append(noeud)
+        noeud = noeud.suiv
+    return noeuds
+
+
+def verifier_arbre(arbre, historique: bool) -> None:
+    gdbh = arbre.parcours_gdbh()
+    assert chainage(arbre) == gdbh
+    for i, noeud in enumerate(gdbh):
+        assert noeud.prec is (gdbh[i - 1] if i > 0 else None)
+        profondeur = 0 if noeud.parent is None else noeud.parent.profondeur + 1
+        assert noeud.profondeur == profondeur
+        hauteur = 0 if noeud.fg is None else 1 + max(noeud.fg.hauteur, noeud.fd.hauteur)
+        assert noeud.hauteur == hauteur
+    if not historique:
+        assert all(gdbh[i].poids <= gdbh[i + 1].poids for i in range(len(gdbh) - 1))
+        assert all(n.poids == n.fg.poids + n.fd.poids for n in gdbh if n.fg is not None)
+
+
+def lire_debut(chemin: str) -> str:
+    with open(chemin, encoding="utf-8") as f:
+        return f.read(LIMITE_CARACTERES)
+
+
+@pytest.mark.parametrize("chemin", TEXTES, ids=os.path.basename)
+def test_chainage_gdbh_moteur_corrige(chemin):
+    arbre = aha_et_utils.AHA(historique=False)
+    for ch in lire_debut(chemin):
+        arbre.modification(ch)
+        verifier_arbre(arbre, historique=False)
+
+
+@pytest.mark.parametrize("chemin", TEXTES, ids=os.path.basename)
+def test_chainage_gdbh_moteur_historique(chemin):
+    arbre = aha_et_utils.AHA(historique=True)
+    for ch in lire_debut(chemin):
+        arbre.modification(ch)
+        verifier_arbre(arbre, historique=True)
+
+
+@pytest.mark.parametrize("chemin", TEXTES, ids=os.path.basename)
+def test_chainage_gdbh_jetons(chemin):
+    # Mode mots : bien plus de symboles, donc des échanges de grands sous-arbres
+    arbre = aha_et_utils.AHA(historique=False)
+    with open(chemin, "rb") as f:
+        for i, jeton in enumerate(modele_mots.lire_jetons(f)):
+            if i == LIMITE_JETONS:
+                break
+            arbre.modification(jeton)
+            verifier_arbre(arbre, historique=False)
+
+
+@pytest.mark.parametrize("chemin", TEXTES, ids=os.path.basename)
+def test_fin_de_bloc_identique_au_parcours(chemin, monkeypatch):
+    # Les fins de bloc retenues par le moteur corrigé doivent donner le même nœud que le parcours du bloc
+    fin_de_bloc = aha_et_utils.AHA.fin_de_bloc
+
+    def comparer(arbre, noeud):
+        fin = fin_de_bloc(arbre, noeud)
+        attendu = noeud
+        while attendu.suiv is not None and attendu.poids >= attendu.suiv.poids:
+            attendu = attendu.suiv
+        assert fin is attendu
+        return fin
+
+    monkeypatch.setattr(aha_et_utils.AHA, "fin_de_bloc", comparer)
+    arbre = aha_et_utils.AHA(historique=False)
+    with open(chemin, "rb") as f:
+        for jeton in modele_mots.lire_jetons(f):
+            arbre.modification(jeton)
+
+
+def test_symboles_tous_distincts():
+    # Chaque symbole est nouveau : insertions successives sous le dièze
+    arbre = aha_et_utils.AHA(historique=False)
+    for i in range(300):
+        arbre.modification(chr(0x4E00 + i))
+        verifier_arbre(arbre, historique=False)
+
+
+@pytest.mark.parametrize("texte", ["le ᛃ chat ᛃ le", "aᛃaᛃbᛃ" * 5, "ᛃᛃ"])
+def test_dieze_reconnu_par_identite(texte):
+    # "ᛃ" dans le texte est un symbole ordinaire : seul le nœud dièze sert d'échappement
+    codeur = aha_et_utils.AHA(historique=False)
+    bits = "".join(codeur.coder_caractere(ch) for ch in texte)
+
+    decodeur = aha_et_utils.AHA(historique=False)
+    lecteur = texte_utils.LecteurBits(io.BytesIO(texte_utils.bits_vers_octets(bits)), len(bits))
+    caracteres = []
+    while lecteur.nb_bits_restants > 0:
+        caracteres.append(decodeur.decoder_caractere(lecteur))
+    assert "".join(caracteres) == texte
+
+
+def test_jetons_avec_litteraux():
+    # coder_caractere / decoder_caractere avec les littéraux du mode mots
+    jetons = ["Le", " ", "chat", ",", " ", "le", " ", "chat", "ᛃ", "ᛃ"]
+    codeur = aha_et_utils.AHA(historique=False)
+    bits = "".join(codeur.coder_caractere(j, modele_mots.litteral_vers_bits) for j in jetons)
+
+    decodeur = aha_et_utils.AHA(historique=False)
+    lecteur = texte_utils.LecteurBits(io.BytesIO(texte_utils.bits_vers_octets(bits)), len(bits))
+    assert [decodeur.decoder_caractere(lecteur, modele_mots.lire_litteral) for _ in jetons] == jetons
+    assert decodeur.decoder_caractere(lecteur, modele_mots.lire_litteral) is None
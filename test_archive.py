@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import io
+
+import pytest
+
+import archive
+
+"""
+Tests de l'archive : création en mémoire, liste, extraction complète ou partielle,
+rendue octet pour octet.
+
+    python3 -m pytest -q test_archive.py
+"""
+
+FICHIERS = {
+    "a.txt": "Le petit chat dort sur le tapis rouge.\n" * 60,
+    "vide.txt": "",
+    "dossier/b.txt": "été, 漢字, ᛃ, \r\n fin de ligne Windows\r\n" * 30,
+    "dossier/sous/c.txt": "x",
+    "d.txt": "Tout autre chose : 0123456789\n" * 80,
+}
+
+
+def creer_archive(taille_groupe_kio: int) -> io.BytesIO:
+    fout = io.BytesIO()
+    ecrivain = archive.EcrivainArchive(fout, taille_groupe_kio)
+    for nom, texte in FICHIERS.items():
+        ecrivain.ajouter(nom, io.BytesIO(texte.encode("utf-8")))
+    ecrivain.terminer()
+    fout.seek(0)
+    return fout
+
+
+@pytest.fixture(params=[0, 1], ids=["un_groupe", "groupes_1kio"])
+def fin(request):
+    return creer_archive(request.param)
+
+
+def test_liste(fin):
+    groupes, entrees = archive.lire_table(fin)
+    assert [e.nom for e in entrees] == list(FICHIERS)
+    assert [e.taille for e in entrees] == [len(t.encode("utf-8")) for t in FICHIERS.values()]
+    assert all(e.groupe < len(groupes) for e in entrees)
+
+
+def test_groupes_de_1_kio():
+    groupes, entrees = archive.lire_table(creer_archive(1))
+    assert len(groupes) > 1
+    assert len({e.groupe for e in entrees}) == len(groupes)
+
+
+def test_extraction_complete(fin, tmp_path):
+    groupes, entrees = archive.lire_table(fin)
+    extraites = archive.extraire(fin, groupes, entrees, str(tmp_path))
+    assert len(extraites) == len(FICHIERS)
+    for nom, texte in FICHIERS.items():
+        assert (tmp_path / nom).read_bytes() == texte.encode("utf-8")
+
+
+@pytest.mark.parametrize("noms", [["dossier/sous/c.txt"], ["vide.txt", "d.txt"]], ids=["une", "deux"])
+def test_extraction_partielle(fin, noms, tmp_path):
+    groupes, entrees = archive.lire_table(fin)
+    archive.extraire(fin, groupes, entrees, str(tmp_path), noms)
+    extraits = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*") if p.is_file())
+    assert extraits == sorted(noms)
+    for nom in noms:
+        assert (tmp_path / nom).read_bytes() == FICHIERS[nom].encode("utf-8")
+
+
+def test_entree_absente(fin, tmp_path):
+    groupes, entrees = archive.lire_table(fin)
+    with pytest.raises(ValueError, match="absente"):
+        archive.extraire(fin, groupes, entrees, str(tmp_path), ["inconnu.txt"])
+
+
+@pytest.mark.parametrize("nom", ["../x.txt", "dossier/../../x.txt", "/tmp/x.txt"])
+def test_nom_dangereux_refuse(nom, tmp_path):
+    with pytest.raises(ValueError, match="dangereux"):
+        archive.chemin_extraction(str(tmp_path), nom)
+
+
+def test_pas_une_archive():
+    with pytest.raises(ValueError):
+        archive.lire_table(io.BytesIO(b"\x00" * 16))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import gzip
+import io
+import os
+
+import pytest
+
+import compressor
+import decompressor
+import modele_blocs
+import serveur_compression
+import texte_utils
+
+"""
+Tests du mode blocs : aller-retour sur du texte et sur des données qui n'en sont pas
+(aléatoires, déjà compressées), rendues octet pour octet.
+
+    python3 -m pytest -q test_blocs.py
+"""
+
+DOSSIER_TEXTES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_texts")
+
+
+def donnees_gzip() -> bytes:
+    with open(os.path.join(DOSSIER_TEXTES, "code_c.txt"), "rb") as f:
+        return gzip.compress(f.read())
+
+
+def donnees_texte() -> bytes:
+    with open(os.path.join(DOSSIER_TEXTES, "sorbonne_html.txt"), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(params=["aleatoire", "gzip", "texte", "melange"])
+def donnees(request):
+    if request.param == "aleatoire":
+        return os.urandom(300000)
+    if request.param == "gzip":
+        return donnees_gzip()
+    if request.param == "texte":
+        return donnees_texte()
+    return donnees_texte()[:100000] + os.urandom(50000) + "é€ᛃ".encode("utf-8") * 1000
+
+
+@pytest.mark.parametrize("en_pipeline", [False, True], ids=["direct", "pipeline"])
+def test_aller_retour_fichier(donnees, en_pipeline, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Registres compression.txt / decompression.txt
+    (tmp_path / "entree.bin").write_bytes(donnees)
+    compressor.compresser_fichier("entree.bin", "sortie.huff", texte_utils.MODE_BLOCS, en_pipeline=en_pipeline)
+    decompressor.decomprimer_fichier("sortie.huff", "retour.bin", en_pipeline)
+    assert (tmp_path / "retour.bin").read_bytes() == donnees
+    # Jamais plus gros que l'entrée, à l'en-tête et aux en-têtes de blocs près
+    nb_blocs = len(donnees) // modele_blocs.TAILLE_BLOC_DEFAUT + 1
+    assert os.path.getsize("sortie.huff") <= (texte_utils.TAILLE_ENTETE_OCTETS + len(donnees)
+                                              + nb_blocs * (1 + modele_blocs.TAILLE_ENTIER))
+
+
+def test_aller_retour_serveur(donnees):
+    compresse = io.BytesIO()
+    compressor.compresser_flux(io.BytesIO(donnees), compresse, texte_utils.MODE_BLOCS)
+    assert serveur_compression.tache_decompression(compresse.getvalue()) == donnees
+
+
+def test_donnees_binaires_en_un_bloc():
+    # Pas de coupure en limite de caractère pour des octets qui ne sont pas de l'UTF-8
+    for _ in range(20):
+        assert len(list(modele_blocs.lire_blocs(io.BytesIO(os.urandom(1000)), 1000))) == 1
+
+
+def test_blocs_de_texte_decodables_seuls():
+    texte = donnees_texte()
+    blocs = list(modele_blocs.lire_blocs(io.BytesIO(texte), 1000))
+    assert b"".join(blocs) == texte
+    for bloc in blocs:
+        bloc.decode("utf-8")
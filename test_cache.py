@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import os
+
+import pytest
+
+import aha_et_utils
+import cache_compression
+import compressor
+import decompressor
+import texte_utils
+
+"""
+Tests du cache de compression : hit / miss, éviction LRU, liens durs (--cache-liens).
+
+    python3 -m pytest -q test_cache.py
+"""
+
+TEXTE_A = "Le petit chat dort sur le tapis rouge. " * 50
+TEXTE_B = "Tout autre chose : 0123456789, ᛃ, été, 漢字. " * 40
+
+
+@pytest.fixture
+def dossier(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Registres compression.txt / decompression.txt
+    (tmp_path / "a.txt").write_text(TEXTE_A, encoding="utf-8")
+    (tmp_path / "b.txt").write_text(TEXTE_B, encoding="utf-8")
+    return tmp_path
+
+
+def nouveau_cache(dossier, liens_durs: bool = False) -> cache_compression.CacheCompression:
+    return cache_compression.CacheCompression(str(dossier / "cache"), liens_durs=liens_durs)
+
+
+def decompresse(chemin_huff: str) -> str:
+    decompressor.decomprimer_fichier(chemin_huff, "retour.txt")
+    with open("retour.txt", encoding="utf-8") as f:
+        return f.read()
+
+
+def dernier_statut_cache() -> str:
+    with open(aha_et_utils.NOM_REGISTRE_COMPR, encoding="utf-8") as f:
+        return f.read().splitlines()[-1].split(";")[-1]
+
+
+@pytest.mark.parametrize("liens_durs", [False, True], ids=["copies", "liens"])
+def test_miss_puis_hit(dossier, liens_durs):
+    cache = nouveau_cache(dossier, liens_durs)
+    compressor.compresser_fichier("a.txt", "a1.huff", texte_utils.MODE_CONTINU, cache=cache)
+    assert dernier_statut_cache() == "miss"
+    compressor.compresser_fichier("a.txt", "a2.huff", texte_utils.MODE_CONTINU, cache=cache)
+    assert dernier_statut_cache() == "hit"
+    assert (dossier / "a1.huff").read_bytes() == (dossier / "a2.huff").read_bytes()
+    assert decompresse("a2.huff") == TEXTE_A
+
+
+def test_cle_depend_du_mode(dossier):
+    cache = nouveau_cache(dossier)
+    compressor.compresser_fichier("a.txt", "a1.huff", texte_utils.MODE_CONTINU, cache=cache)
+    compressor.compresser_fichier("a.txt", "a2.huff", texte_utils.MODE_BLOCS, cache=cache)
+    assert dernier_statut_cache() == "miss"
+    assert decompresse("a2.huff") == TEXTE_A
+
+
+def test_sortie_liee_non_reecrite_sans_cache(dossier):
+    # 1. sortie en lien dur vers l'entrée du cache ; 2. la même sortie réécrite sans --cache ;
+    # 3. le hit suivant doit toujours rendre la compression de a.txt
+    compressor.compresser_fichier("a.txt", "out.huff", texte_utils.MODE_CONTINU, cache=nouveau_cache(dossier, True))
+    compressor.compresser_fichier("b.txt", "out.huff", texte_utils.MODE_CONTINU)
+    assert decompresse("out.huff") == TEXTE_B
+    compressor.compresser_fichier("a.txt", "a2.huff", texte_utils.MODE_CONTINU, cache=nouveau_cache(dossier))
+    assert dernier_statut_cache() == "hit"
+    assert decompresse("a2.huff") == TEXTE_A
+
+
+def test_hit_sur_sa_propre_sortie_liee(dossier):
+    # Une sortie déjà liée à l'entrée du cache reste valide (pas de SameFileError)
+    cache = nouveau_cache(dossier, True)
+    compressor.compresser_fichier("a.txt", "out.huff", texte_utils.MODE_CONTINU, cache=cache)
+    compressor.compresser_fichier("a.txt", "out.huff", texte_utils.MODE_CONTINU, cache=cache)
+    cache_copies = nouveau_cache(dossier)
+    compressor.compresser_fichier("a.txt", "out.huff", texte_utils.MODE_CONTINU, cache=cache_copies)
+    assert dernier_statut_cache() == "hit"
+    assert decompresse("out.huff") == TEXTE_A
+
+
+def test_eviction_lru(dossier):
+    cache = nouveau_cache(dossier)
+    cles = []
+    for i in range(3):
+        nom = f"t{i}.txt"
+        (dossier / nom).write_text(f"{i} " * 1000, encoding="utf-8")
+        compressor.compresser_fichier(nom, f"t{i}.huff", texte_utils.MODE_CONTINU, cache=cache)
+        cles.append(cache.cle(nom, texte_utils.MODE_CONTINU))
+        os.utime(cache.chemin(cles[-1]), (1000 + i, 1000 + i))  # Ordre d'utilisation sans ambiguïté
+
+    # Le hit rafraîchit t0 : c'est t1 la moins récemment utilisée
+    assert cache.recuperer(cles[0], "t0bis.huff")
+    cache.taille_max = sum(os.path.getsize(cache.chemin(c)) for c in cles) - 1
+    cache.evincer()
+    assert os.path.exists(cache.chemin(cles[0]))
+    assert not os.path.exists(cache.chemin(cles[1]))
+    assert os.path.exists(cache.chemin(cles[2]))
+    assert not cache.recuperer(cles[1], "t1bis.huff")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import io
+import os
+import threading
+import time
+
+import pytest
+
+import decompressor
+import modele_continu
+import texte_utils
+
+"""
+Tests du mode continu : aller-retour en mémoire, et décodage de chaque préfixe
+vidé (sync-flush) sans attendre la fin du flux.
+
+    python3 -m pytest -q test_continu.py
+"""
+
+TEXTE = ("12:00:01 INFO connexion de été@exemple.fr, 漢字, ᛃ\n" * 300).encode("utf-8")
+
+
+def decode_flux(donnees: bytes) -> bytes:
+    entree = io.BytesIO(donnees)
+    mode, _ = texte_utils.lire_entete(entree.read(texte_utils.TAILLE_ENTETE_OCTETS))
+    assert mode == texte_utils.MODE_CONTINU
+    sortie = io.StringIO(newline="")
+    modele_continu.decomprimer_flux_continu(entree, sortie)
+    return sortie.getvalue().encode("utf-8")
+
+
+def test_chaque_segment_decodable_des_sa_reception():
+    # Morceaux de 13 octets : des caractères UTF-8 sont coupés entre deux appels à coder()
+    texte = TEXTE[:2000]
+    fout = io.BytesIO()
+    codeur = modele_continu.CodeurContinu(fout)
+    for debut in range(0, len(texte), 13):
+        codeur.coder(texte[debut:debut + 13])
+        codeur.vider()
+        # Flux coupé ici, sans marqueur de fin : tout caractère complet reçu est rendu
+        envoye = texte[:debut + 13]
+        recu = decode_flux(fout.getvalue())
+        assert envoye.startswith(recu) and len(envoye) - len(recu) < 4
+    codeur.terminer()
+    assert decode_flux(fout.getvalue()) == texte
+    assert decompressor.decomprimer_octets(fout.getvalue()) == texte
+
+
+@pytest.mark.parametrize("flush_kio", [1, 4, modele_continu.FLUSH_KIO_DEFAUT])
+def test_aller_retour_flux(flush_kio):
+    fout = io.BytesIO()
+    modele_continu.compresser_flux_continu(io.BytesIO(TEXTE), fout, flush_kio=flush_kio)
+    assert decompressor.decomprimer_octets(fout.getvalue()) == TEXTE
+
+
+def test_vidange_selon_le_volume():
+    fout = io.BytesIO()
+    codeur = modele_continu.CodeurContinu(fout)
+    for debut in range(0, len(TEXTE), 1000):
+        codeur.coder(TEXTE[debut:debut + 1000])
+        if codeur.octets_en_attente >= 4096:
+            codeur.vider()
+    codeur.terminer()
+    assert codeur.nb_segments == -(-len(TEXTE) // 5000)
+    assert decode_flux(fout.getvalue()) == TEXTE
+
+
+def test_vidange_selon_la_duree():
+    # Deux écritures séparées par une pause bien plus longue que flush_ms : deux segments au moins
+    lecture, ecriture = os.pipe()
+
+    def producteur():
+        with open(ecriture, "wb", buffering=0) as f:
+            f.write(TEXTE[:100])
+            time.sleep(0.3)
+            f.write(TEXTE[100:])
+
+    fil = threading.Thread(target=producteur)
+    fil.start()
+    fout = io.BytesIO()
+    with open(lecture, "rb") as fin:
+        codeur = modele_continu.compresser_flux_continu(fin, fout, flush_ms=20)
+    fil.join()
+    assert codeur.nb_segments >= 2
+    assert decompressor.decomprimer_octets(fout.getvalue()) == TEXTE
+
+
+def test_flux_vide():
+    fout = io.BytesIO()
+    codeur = modele_continu.compresser_flux_continu(io.BytesIO(b""), fout)
+    assert codeur.nb_segments == 0
+    assert len(fout.getvalue()) == texte_utils.TAILLE_ENTETE_OCTETS + modele_continu.TAILLE_LONGUEUR_SEGMENT
+    assert decompressor.decomprimer_octets(fout.getvalue()) == b""
+
+
+def test_segment_tronque():
+    fout = io.BytesIO()
+    modele_continu.compresser_flux_continu(io.BytesIO(TEXTE), fout)
+    with pytest.raises(ValueError, match="tronqué"):
+        decode_flux(fout.getvalue()[:texte_utils.TAILLE_ENTETE_OCTETS + 10])
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import io
+
+import pytest
+
+import aha_et_utils
+import compressor
+import decompressor
+import texte_utils
+
+"""
+Aller-retour par ./compresser et ./decompresser (compresser_fichier / decomprimer_fichier)
+dans chaque mode, sur des cas limites : fichier vide, un seul caractère, caractère du dièze.
+
+    python3 -m pytest -q test_modes.py
+"""
+
+MODES_FICHIER = [m for m in texte_utils.NOMS_MODES if m != texte_utils.MODE_ARCHIVE]
+
+
+@pytest.mark.parametrize("mode", MODES_FICHIER, ids=texte_utils.NOMS_MODES.get)
+@pytest.mark.parametrize("texte", ["", "a", "é", "\n"], ids=["vide", "a", "e_accent", "saut"])
+def test_aller_retour_petit_fichier(mode, texte, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Registres compression.txt / decompression.txt
+    (tmp_path / "entree.txt").write_bytes(texte.encode("utf-8"))
+    compressor.compresser_fichier("entree.txt", "sortie.huff", mode)
+    decompressor.decomprimer_fichier("sortie.huff", "retour.txt")
+    assert (tmp_path / "retour.txt").read_bytes() == texte.encode("utf-8")
+
+    # Une ligne par opération dans les registres, même pour un fichier vide
+    for registre in (aha_et_utils.NOM_REGISTRE_COMPR, aha_et_utils.NOM_REGISTRE_DECOMPR):
+        assert len((tmp_path / registre).read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_mode_caractere_refuse_le_caractere_du_dieze():
+    texte = "漢字 abc ᛃ def".encode("utf-8")
+    with pytest.raises(ValueError, match="U\\+16C3"):
+        compressor.compresser_flux(io.BytesIO(texte), io.BytesIO(), texte_utils.MODE_CARACTERE)
+
+
+@pytest.mark.parametrize("mode", [m for m in MODES_FICHIER if m != texte_utils.MODE_CARACTERE],
+                         ids=texte_utils.NOMS_MODES.get)
+def test_caractere_du_dieze_dans_les_autres_modes(mode):
+    texte = ("漢字 abc ᛃ def\n" * 200).encode("utf-8")
+    compresse = io.BytesIO()
+    compressor.compresser_flux(io.BytesIO(texte), compresse, mode)
+    assert decompressor.decomprimer_octets(compresse.getvalue()) == texte
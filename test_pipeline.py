@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import io
+import os
+
+import pytest
+
+import compressor
+import decompressor
+import pipeline
+import texte_utils
+
+"""
+Tests des étages lecteur / écrivain (--pipeline) : mêmes octets qu'en direct,
+avec de tout petits blocs pour multiplier les passages d'un bloc à l'autre.
+
+    python3 -m pytest -q test_pipeline.py
+"""
+
+MODES_FICHIER = [m for m in texte_utils.NOMS_MODES if m != texte_utils.MODE_ARCHIVE]
+TEXTE = ("Le petit chat dort sur le tapis rouge. été, 漢字, € \n" * 200).encode("utf-8")
+TAILLE_BLOC = 7  # Coupe les caractères UTF-8 et les en-têtes entre deux blocs
+
+
+class FichierDefaillant(io.BytesIO):
+    def read(self, n=-1):
+        raise OSError("disque débranché")
+
+    def write(self, donnees):
+        raise OSError("disque plein")
+
+
+def avec_etages(fonction, fin, fout) -> None:
+    # Comme pipeline.etages, avec de petits blocs et des files courtes
+    lecteur = pipeline.LecteurAnticipe(fin, TAILLE_BLOC, profondeur=2)
+    ecrivain = pipeline.EcrivainDiffere(fout, TAILLE_BLOC, profondeur=2)
+    try:
+        fonction(lecteur, ecrivain)
+    finally:
+        lecteur.fermer()
+        ecrivain.fermer()
+
+
+@pytest.mark.parametrize("tailles", [[1], [3, 5], [TAILLE_BLOC], [100]], ids=str)
+def test_lecteur_anticipe(tailles):
+    donnees = os.urandom(1000)
+    lecteur = pipeline.LecteurAnticipe(io.BytesIO(donnees), TAILLE_BLOC, profondeur=2)
+    morceaux = []
+    i = 0
+    while True:
+        morceau = lecteur.read(tailles[i % len(tailles)])
+        if not morceau:
+            break
+        morceaux.append(morceau)
+        i += 1
+    lecteur.fermer()
+    assert b"".join(morceaux) == donnees
+
+
+def test_lecteur_anticipe_lit_le_reste():
+    lecteur = pipeline.LecteurAnticipe(io.BytesIO(TEXTE), TAILLE_BLOC)
+    debut = lecteur.read(10)
+    assert debut + lecteur.read() == TEXTE
+    assert lecteur.read(1) == b""
+    lecteur.fermer()
+
+
+def test_lecteur_abandonne_avant_la_fin():
+    # fermer() débloque le fil même si la file est pleine
+    lecteur = pipeline.LecteurAnticipe(io.BytesIO(TEXTE), TAILLE_BLOC, profondeur=1)
+    lecteur.read(3)
+    lecteur.fermer()
+    assert not lecteur.fil.is_alive()
+
+
+def test_erreur_de_lecture_relevee():
+    lecteur = pipeline.LecteurAnticipe(FichierDefaillant(), TAILLE_BLOC)
+    with pytest.raises(OSError, match="débranché"):
+        lecteur.read(1)
+    lecteur.fermer()
+
+
+def test_ecrivain_differe_seek_tell():
+    fout = io.BytesIO()
+    ecrivain = pipeline.EcrivainDiffere(fout, TAILLE_BLOC, profondeur=2)
+    ecrivain.write(b"\x00" * 8)  # En-tête réservé, comme compresser_flux
+    for i in range(100):
+        ecrivain.write(bytes([i]) * 3)
+    assert ecrivain.tell() == 308
+    ecrivain.seek(0)
+    ecrivain.write(b"ENTETE!!")
+    ecrivain.fermer()
+    assert fout.getvalue() == b"ENTETE!!" + b"".join(bytes([i]) * 3 for i in range(100))
+
+
+def test_erreur_d_ecriture_relevee():
+    ecrivain = pipeline.EcrivainDiffere(FichierDefaillant(), TAILLE_BLOC)
+    ecrivain.write(b"x" * 100)
+    with pytest.raises(OSError, match="plein"):
+        ecrivain.fermer()
+
+
+def test_etages_inactifs():
+    fin, fout = io.BytesIO(), io.BytesIO()
+    with pipeline.etages(fin, fout, actif=False) as (flux_entree, flux_sortie):
+        assert flux_entree is fin and flux_sortie is fout
+
+
+@pytest.mark.parametrize("mode", MODES_FICHIER, ids=texte_utils.NOMS_MODES.get)
+def test_aller_retour_en_memoire(mode):
+    direct = io.BytesIO()
+    compressor.compresser_flux(io.BytesIO(TEXTE), direct, mode)
+
+    compresse = io.BytesIO()
+    avec_etages(lambda fin, fout: compressor.compresser_flux(fin, fout, mode), io.BytesIO(TEXTE), compresse)
+    assert compresse.getvalue() == direct.getvalue()
+
+    entete = compresse.getvalue()[:texte_utils.TAILLE_ENTETE_OCTETS]
+    sortie = io.BytesIO() if decompressor.sortie_binaire(entete) else io.StringIO(newline="")
+    avec_etages(decompressor.decomprimer_flux, io.BytesIO(compresse.getvalue()), sortie)
+    retour = sortie.getvalue()
+    assert (retour if isinstance(retour, bytes) else retour.encode("utf-8")) == TEXTE
+
+
+@pytest.mark.parametrize("mode", MODES_FICHIER, ids=texte_utils.NOMS_MODES.get)
+def test_aller_retour_fichier(mode, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Registres compression.txt / decompression.txt
+    (tmp_path / "entree.txt").write_bytes(TEXTE)
+    compressor.compresser_fichier("entree.txt", "sortie.huff", mode, en_pipeline=True)
+    decompressor.decomprimer_fichier("sortie.huff", "retour.txt", en_pipeline=True)
+    assert (tmp_path / "retour.txt").read_bytes() == TEXTE
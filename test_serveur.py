@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+import aha_et_utils
+import client_compression
+import compressor
+import serveur_compression
+
+"""
+Tests du serveur de compression : aller-retour client → serveur → client sur une
+socket Unix, compteurs, erreurs et requêtes refusées.
+
+    python3 -m pytest -q test_serveur.py
+"""
+
+TEXTE = ("Le petit chat dort sur le tapis rouge. été, 漢字, € \n" * 300).encode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def serveur(tmp_path_factory):
+    # Boucle asyncio dans un fil : le client (bloquant) tourne dans le fil du test
+    chemin_socket = str(tmp_path_factory.mktemp("srv") / "aha.sock")
+    serveur = serveur_compression.ServeurCompression(nb_processus=1)
+    boucle = {}
+
+    async def lancer():
+        boucle["boucle"], boucle["tache"] = asyncio.get_running_loop(), asyncio.current_task()
+        await serveur.servir(chemin_socket)
+
+    def executer():
+        # asyncio.run annule aussi les connexions encore ouvertes à l'arrêt
+        try:
+            asyncio.run(lancer())
+        except asyncio.CancelledError:
+            pass
+
+    fil = threading.Thread(target=executer, daemon=True)
+    fil.start()
+    for _ in range(500):
+        if os.path.exists(chemin_socket):
+            break
+        time.sleep(0.01)
+    serveur.chemin_socket = chemin_socket
+    yield serveur
+    boucle["boucle"].call_soon_threadsafe(boucle["tache"].cancel)
+    fil.join()
+
+
+@pytest.fixture
+def client(serveur):
+    with client_compression.ClientCompression(serveur.chemin_socket) as client:
+        yield client
+
+
+def test_taches():
+    compresse = serveur_compression.tache_compression(TEXTE)
+    assert len(compresse) < len(TEXTE)
+    assert serveur_compression.tache_decompression(compresse) == TEXTE
+
+
+@pytest.mark.parametrize("texte", [b"", "é".encode("utf-8"), TEXTE], ids=["vide", "e_accent", "texte"])
+def test_aller_retour(client, texte):
+    compresse = client.compresser(texte)
+    assert compresse == serveur_compression.tache_compression(texte)
+    assert client.decompresser(compresse) == texte
+
+
+def test_plusieurs_requetes_et_compteurs(client):
+    avant = client.statistiques()
+    for _ in range(3):
+        assert client.decompresser(client.compresser(TEXTE)) == TEXTE
+    apres = client.statistiques()
+    assert apres["terminees"] - avant["terminees"] == 6
+    assert apres["octets_recus"] - avant["octets_recus"] >= 3 * len(TEXTE)
+    assert apres["en_cours"] == 0 and apres["en_attente"] == 0
+    assert apres["latence_moyenne_ms"] > 0
+
+
+def test_erreur_de_tache_renvoyee(client):
+    # Le dièze est refusé en mode caractère ; la connexion reste utilisable
+    avant = client.statistiques()["erreurs"]
+    with pytest.raises(RuntimeError, match="U\\+16C3"):
+        client.compresser("ᛃ".encode("utf-8"))
+    assert client.statistiques()["erreurs"] == avant + 1
+    assert client.decompresser(client.compresser(TEXTE)) == TEXTE
+
+
+def test_operation_inconnue(client):
+    with pytest.raises(RuntimeError, match="inconnue"):
+        client.requete(b"X", b"abc")
+
+
+def test_requete_trop_grande_refusee(serveur):
+    taille_max = serveur.taille_max
+    serveur.taille_max = 1000
+    try:
+        with client_compression.ClientCompression(serveur.chemin_socket) as client:
+            avant = client.statistiques()["refusees"]
+            with pytest.raises(RuntimeError, match="trop grande"):
+                client.compresser(b"x" * 2000)
+        with client_compression.ClientCompression(serveur.chemin_socket) as client:
+            # Bien plus que les tampons de la socket : l'envoi est coupé, le message d'erreur reste lisible
+            with pytest.raises(RuntimeError, match="trop grande"):
+                client.compresser(b"x" * (16 << 20))
+        with client_compression.ClientCompression(serveur.chemin_socket) as client:
+            assert client.statistiques()["refusees"] == avant + 2
+            assert client.decompresser(client.compresser(b"x" * 1000)) == b"x" * 1000
+    finally:
+        serveur.taille_max = taille_max
+
+
+def test_fichiers(client, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Registres compression.txt / decompression.txt
+    (tmp_path / "entree.txt").write_bytes(TEXTE)
+    client.compresser_fichier("entree.txt", "sortie.huff")
+    compressor.compresser_fichier("entree.txt", "locale.huff")
+    assert (tmp_path / "sortie.huff").read_bytes() == (tmp_path / "locale.huff").read_bytes()
+    client.decompresser_fichier("sortie.huff", "retour.txt")
+    assert (tmp_path / "retour.txt").read_bytes() == TEXTE
+    for registre in (aha_et_utils.NOM_REGISTRE_COMPR, aha_et_utils.NOM_REGISTRE_DECOMPR):
+        assert (tmp_path / registre).exists()
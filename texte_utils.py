@@ -1,3 +1,6 @@
+import codecs
+
+
 class LecteurBits:
     """
     Lit des bits (0/1) à partir d'un flux binaire.
@@ -115,3 +118,138 @@ def ecrire_bits(fout, bits: str, etat):
             fout.write(bytes([etat["current_byte"]]))
             etat["current_byte"] = 0
             etat["bit_pos"] = 0
+
+
+def bits_vers_octets(bits: str) -> bytes:
+    """
+    Convertit d'un coup une chaîne '0'/'1' en octets, avec padding de 0 à la fin.
+    """
+    if not bits:
+        return b""
+    nb_octets = (len(bits) + 7) // 8
+    return (int(bits, 2) << (8 * nb_octets - len(bits))).to_bytes(nb_octets, "big")
+
+
+"""
+En-tête des fichiers .huff : 8 octets big-endian.
+L'octet de poids fort donne le mode de codage, les 7 autres le nombre de bits utiles.
+Le mode 0 correspond à l'ancien format (nb_bits sur 8 octets), qui reste donc lisible.
+"""
+
+TAILLE_ENTETE_OCTETS = 8
+MODE_CARACTERE = 0  # Un arbre AHA, symboles = caractères (format historique)
+MODE_ORDRE1 = 1  # Un arbre AHA par caractère précédent, repli sur l'ordre 0
+MODE_MOTS = 2  # Symboles = mots, suites d'espaces et ponctuation
+MODE_ARCHIVE = 3  # Archive multi-fichiers (archive.py) : les 7 octets bas donnent la position de la table des matières
+MODE_BLOCS = 4  # Stocké / Huffman statique / AHA choisi bloc par bloc : les 7 octets bas donnent la taille d'origine
+MODE_CONTINU = 5  # Segments vidables au fil de l'eau (modele_continu.py), en-tête sans nb_bits
+
+NOMS_MODES = {
+    MODE_CARACTERE: "caractere",
+    MODE_ORDRE1: "ordre1",
+    MODE_MOTS: "mots",
+    MODE_BLOCS: "blocs",
+    MODE_CONTINU: "continu",
+}
+
+
+def ecrire_entete(fout, mode: int, nb_bits: int) -> None:
+    """
+    Écrit l'en-tête de 8 octets (mode + nb_bits) à la position courante de fout.
+    """
+    if nb_bits >= 1 << 56:
+        raise ValueError("Flux trop long pour l'en-tête (nb_bits sur 7 octets)")
+    fout.write(((mode << 56) | nb_bits).to_bytes(TAILLE_ENTETE_OCTETS, byteorder="big"))
+
+
+def reserver_entete(fout) -> int:
+    """
+    Réserve l'en-tête (8 octets à 0) à la position courante de fout et renvoie cette position.
+    """
+    position = fout.tell()
+    fout.write(b"\x00" * TAILLE_ENTETE_OCTETS)
+    return position
+
+
+def ecrire_entete_reservee(fout, position: int, mode: int, nb_bits: int) -> None:
+    """
+    Écrit l'en-tête réservé par reserver_entete, puis revient à la fin du flux (fout positionnable).
+    """
+    fin_flux = fout.tell()
+    fout.seek(position)
+    ecrire_entete(fout, mode, nb_bits)
+    fout.seek(fin_flux)
+
+
+def completer_octet(fout, etat) -> None:
+    """
+    Padding : complète avec des 0 le dernier octet commencé par ecrire_bits (nb_bits ne change pas).
+    """
+    if etat["bit_pos"] > 0:
+        fout.write(bytes([etat["current_byte"] << (8 - etat["bit_pos"])]))
+        etat["current_byte"] = 0
+        etat["bit_pos"] = 0
+
+
+def terminer_flux_bits(fout, etat, position_entete: int, mode: int) -> None:
+    """
+    Fin d'un flux écrit par ecrire_bits : padding, puis en-tête (mode + nb_bits utiles)
+    à la place réservée au début.
+    """
+    completer_octet(fout, etat)
+    ecrire_entete_reservee(fout, position_entete, mode, etat["nb_bits"])
+
+
+def lire_entete(entete: bytes, modes_acceptes=NOMS_MODES):
+    """
+    Décode un en-tête de 8 octets et renvoie (mode, nb_bits).
+    """
+    if len(entete) != TAILLE_ENTETE_OCTETS:
+        raise ValueError("Fichier compressé invalide : en-tête manquante ou incomplète.")
+    valeur = int.from_bytes(entete, "big")
+    mode = valeur >> 56
+    if mode == MODE_ARCHIVE and mode not in modes_acceptes:
+        raise ValueError("Ce fichier est une archive multi-fichiers : utilisez archive.py.")
+    if mode not in modes_acceptes:
+        raise ValueError(f"Fichier compressé invalide : mode inconnu ({mode}).")
+    return mode, valeur & ((1 << 56) - 1)
+
+
+def lire_blocs_texte(fin, taille_bloc: int = 1 << 16):
+    """
+    Générateur de blocs de texte décodés depuis un flux binaire UTF-8
+    (un caractère coupé entre deux blocs est reporté au bloc suivant).
+    """
+    decodeur = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        bloc = fin.read(taille_bloc)
+        if not bloc:
+            break
+        yield decodeur.decode(bloc)
+    yield decodeur.decode(b"", final=True)
+
+
+def lire_caracteres(fin, taille_bloc: int = 1 << 16):
+    """
+    Générateur des caractères UTF-8 d'un flux binaire, lu par blocs.
+    """
+    for texte in lire_blocs_texte(fin, taille_bloc):
+        yield from texte
+
+
+def lire_caractere_utf8(lecteur: LecteurBits) -> str:
+    """
+    Lit un caractère UTF-8 littéral (1 à 4 octets) dans le flux de bits.
+    La longueur est donnée par les bits de tête du premier octet.
+    """
+    premier = int(lecteur.lire_n_bits(8), 2)
+    if premier < 0x80:
+        nb_octets = 1
+    elif premier >> 5 == 0b110:
+        nb_octets = 2
+    elif premier >> 4 == 0b1110:
+        nb_octets = 3
+    else:
+        nb_octets = 4
+    bits = f"{premier:08b}" + lecteur.lire_n_bits(8 * (nb_octets - 1))
+    return bits_to_char(bits)